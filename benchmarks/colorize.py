@@ -0,0 +1,40 @@
+"""
+Colorizing a generated log file with the default rules
+on 1 to as many processes as CPUs, in MB/s.
+"""
+import io
+import os
+import time
+
+from autopalette import AutoFormat, Ansi256Renderer
+
+LEVELS = ('INFO', 'INFO', 'INFO', 'DEBUG', 'WARNING', 'ERROR')
+MEGABYTES = 64
+
+
+def make_log(size: int) -> bytes:
+    lines = []
+    for index in range(2000):
+        lines.append('2018-06-02 10:15:{:02d},{:03d} {} request from 10.0.{}.{} '
+                     'path=/api/v1/items/{} took {}ms\n'.format(
+                index % 60, index % 1000, LEVELS[index % len(LEVELS)],
+                index % 256, index % 199, index, index % 700).encode())
+    block = b''.join(lines)
+    return block * (size // len(block) + 1)
+
+
+if __name__ == '__main__':
+    af = AutoFormat(term_colors=256, renderer=Ansi256Renderer)
+    colorizer = af.colorizer()
+    data = make_log(MEGABYTES << 20)
+    counts = sorted({1, 2, 4, 8, os.cpu_count() or 1})
+    baseline = None
+    for workers in counts:
+        if workers > (os.cpu_count() or 1) * 2:
+            break
+        start = time.perf_counter()
+        colorizer.colorize_file(io.BytesIO(data), io.BytesIO(), workers=workers)
+        seconds = time.perf_counter() - start
+        baseline = baseline or seconds
+        print('{:>3} workers {:8.1f} MB/s  speedup {:4.2f}x'.format(
+                workers, len(data) / seconds / (1 << 20), baseline / seconds))
@@ -0,0 +1,39 @@
+"""
+Cost of af(...) with fix_all on a 16-color terminal, for ASCII-only
+log traffic and for lines with non-ASCII text and emoji,
+against running ftfy and emoji2text on every string.
+
+Requires ftfy and emoji2text.
+"""
+import timeit
+
+from autopalette import AutoFormat
+
+LINES = [
+    '2018-06-02 10:15:{:02d} INFO request id={} status=200 path=/api/v1/items'.format(
+        second % 60, second)
+    for second in range(1000)
+]
+MIXED = ['deploy {} ✔ café I \U0001f49b Unicode!'.format(index % 50)
+         for index in range(1000)]
+
+af = AutoFormat()
+af.init(term_colors=16, fix_all=True)
+
+
+def unconditional(lines):
+    for line in lines:
+        af.fix_emoji(af.fix_text(line), ':')
+
+
+def fast_path(lines):
+    for line in lines:
+        af.fix(line)
+
+
+for name, lines in (('ascii', LINES), ('mixed', MIXED)):
+    for label, function in (('unconditional', unconditional),
+                            ('fast path', fast_path)):
+        seconds = min(timeit.repeat(lambda: function(lines), number=1, repeat=5))
+        print('{:<6} {:<14} {:8.2f} us/line'.format(
+                name, label, seconds / len(lines) * 1e6))
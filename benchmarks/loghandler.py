@@ -0,0 +1,54 @@
+"""
+Logging latency seen by the logging thread and total throughput,
+rendering colors synchronously in a StreamHandler formatter against
+handing records to the background thread of QueueHandler.
+"""
+import logging
+import os
+import time
+
+from autopalette import AutoFormat, Ansi256Renderer
+from autopalette.loghandler import LEVEL_STYLES, QueueHandler
+
+RECORDS = 50000
+
+af = AutoFormat(term_colors=256, renderer=Ansi256Renderer)
+
+
+class ColorFormatter(logging.Formatter):
+    def format(self, record):
+        text = super().format(record)
+        return str(getattr(af(text), LEVEL_STYLES[record.levelno]))
+
+
+def run(name, handler):
+    log = logging.getLogger('benchmark.' + name)
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    log.addHandler(handler)
+    latencies = []
+    start = time.perf_counter()
+    for index in range(RECORDS):
+        before = time.perf_counter()
+        log.info('request id=%d status=%d path=%s', index, 200, '/api/v1/items')
+        latencies.append(time.perf_counter() - before)
+    handler.flush()
+    seconds = time.perf_counter() - start
+    handler.close()
+    log.removeHandler(handler)
+    latencies.sort()
+    print('{:<13} {:>9.0f} records/s  p50 {:6.2f} us  p99 {:6.2f} us  dropped {}'
+          .format(name, RECORDS / seconds,
+                  latencies[len(latencies) // 2] * 1e6,
+                  latencies[len(latencies) * 99 // 100] * 1e6,
+                  getattr(handler, 'dropped', 0)))
+
+
+with open(os.devnull, 'w') as devnull:
+    synchronous = logging.StreamHandler(devnull)
+    synchronous.setFormatter(ColorFormatter())
+    run('synchronous', synchronous)
+    for overflow in ('block', 'drop', 'sample'):
+        run('queue ' + overflow,
+            QueueHandler(devnull, af=af, color=True, overflow=overflow,
+                         max_queue=1000))
@@ -0,0 +1,75 @@
+"""
+Regenerate src/autopalette/widthtable.py from the `unicodedata` module
+of the running Python, which decides the Unicode version:
+
+    python bin/generate-widthtable.py
+"""
+import os
+import sys
+import unicodedata
+
+OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      '..', 'src', 'autopalette', 'widthtable.py')
+
+HEADER = '''\
+"""
+Unicode ranges for `autopalette.width`, as inclusive (first, last)
+code point pairs sorted for binary search.
+
+Generated by bin/generate-widthtable.py from the `unicodedata`
+module, Unicode {version}.
+"""
+
+UNICODE_VERSION = '{version}'
+'''
+
+
+def zero_width(char):
+    return bool(unicodedata.combining(char)) \
+        or unicodedata.category(char) in ('Mn', 'Me', 'Cf', 'Cc')
+
+
+def wide(char):
+    return unicodedata.east_asian_width(char) in ('W', 'F') \
+        and not zero_width(char)
+
+
+def ranges(predicate):
+    found = []
+    first = None
+    for code in range(sys.maxunicode + 1):
+        if predicate(chr(code)):
+            if first is None:
+                first = code
+        elif first is not None:
+            found.append((first, code - 1))
+            first = None
+    if first is not None:
+        found.append((first, sys.maxunicode))
+    return found
+
+
+def table(name, comment, pairs):
+    lines = ['', '# ' + comment, name + ' = (']
+    for index in range(0, len(pairs), 3):
+        lines.append('    ' + ' '.join('(0x{:05x}, 0x{:05x}),'.format(*pair)
+                                       for pair in pairs[index:index + 3]))
+    lines.append(')')
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    source = HEADER.format(version=unicodedata.unidata_version)
+    source += table('ZERO_WIDTH',
+                    'Combining marks, format and control characters.',
+                    ranges(zero_width))
+    source += table('WIDE',
+                    'East Asian wide and fullwidth characters, '
+                    'including emoji with emoji presentation.',
+                    ranges(wide))
+    with open(OUTPUT, 'w') as outfile:
+        outfile.write(source)
+
+
+if __name__ == '__main__':
+    main()
@@ -20,7 +20,12 @@ from .render import (
     Ansi8Renderer,
     AnsiNoColorRenderer,
 )
+from .style import Style
 from .autoformat import AutoFormat
+from .instrument import stats
+from .profile import start_from_environ as _start_profile
+
+_start_profile()
 
 af = AutoFormat()
 ap = af
@@ -37,10 +42,12 @@ __all__ = [
     'AutoPalette',
     'Theme',
     'ThemeColor',
+    'Style',
     'BasicTheme',
     'FourColorTheme',
     'Gray4Palette',
     'GameBoyGreenPalette',
     'GameBoyChocolatePalette',
     'Oil6Palette',
+    'stats',
 ]
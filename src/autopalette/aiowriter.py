@@ -0,0 +1,183 @@
+"""
+Styled output for asyncio programs without blocking the event loop.
+
+`AsyncWriter` wraps an `asyncio.StreamWriter`. Values written during
+one event loop iteration are rendered into segments (see
+`autopalette.writer.split`) and handed to the transport as a single
+write at the end of the iteration. `await drain()` waits while the
+transport buffer is above its high-water mark, so fast producers
+slow down to the speed of the reader instead of buffering without limit.
+
+Whether to write colors is decided per stream: a pipe that is a
+terminal with colors gets escape sequences, anything else plain text.
+`open_writer()` connects to a duplicate of the file descriptor of
+a file object such as `sys.stdout`, which stays open after `close()`.
+The descriptor is non-blocking while the writer is open,
+the file object should not be written to directly until then.
+The event loop can only watch pipes, sockets and terminals: for
+a regular file, e.g. when stdout is redirected to one, writes go
+straight to the file and `drain()` has nothing to wait for:
+
+    out = await open_writer(sys.stdout)
+    out.print(af('deploy').h1, 'done')
+    await out.drain()
+"""
+from typing import List
+
+import asyncio
+import os
+import stat
+import sys
+
+from autopalette.utils import terminal_colors
+from autopalette.writer import PrintMixin, Segment, split
+
+try:
+    _running_loop = asyncio.get_running_loop
+except AttributeError:  # Python 3.6
+    _running_loop = asyncio.get_event_loop
+
+
+class AsyncWriter(PrintMixin):
+    """
+    Wrap a StreamWriter, which is only closed on `close()`
+    if the writer `owns` it.
+
+    >>> import asyncio, os
+    >>> from autopalette import AutoFormat, Ansi256Renderer
+    >>> af = AutoFormat(term_colors=256, renderer=Ansi256Renderer)
+    >>> async def main(pipe, color):
+    ...     out = await open_writer(pipe, af=af, color=color)
+    ...     out.print(af('ERROR').err, 'disk full')
+    ...     out.write('ok', style='ok')
+    ...     await out.drain()
+    ...     await out.close()
+    >>> loop = asyncio.new_event_loop()
+    >>> for color in (True, None):
+    ...     read_fd, write_fd = os.pipe()
+    ...     with os.fdopen(write_fd, 'wb') as pipe:
+    ...         loop.run_until_complete(main(pipe, color))
+    ...         print(os.read(read_fd, 1024), pipe.closed, os.get_blocking(write_fd))
+    ...     os.close(read_fd)
+    b'\\x1b[38;5;231;48;5;196mERROR\\x1b[0m disk full\\n\\x1b[38;5;28mok\\x1b[0m' False True
+    b'ERROR disk full\\nok' False True
+    >>> import tempfile
+    >>> with tempfile.TemporaryFile() as file:
+    ...     loop.run_until_complete(main(file, None))
+    ...     _ = file.seek(0)
+    ...     file.read()
+    b'ERROR disk full\\nok'
+    >>> loop.close()
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, af=None,
+                 color: bool = None, encoding: str = 'utf-8',
+                 owns: bool = False) -> None:
+        if af is None:
+            from autopalette import af
+        if color is None:
+            pipe = writer.get_extra_info('pipe')
+            try:
+                color = pipe is not None and terminal_colors(pipe) != 0
+            except (AttributeError, ValueError, OSError):
+                color = False
+        self.writer = writer
+        self.af = af
+        self.color = color
+        self.encoding = encoding
+        self.owns = owns
+        self._segments = []  # type: List[Segment]
+        self._scheduled = False
+
+    def write(self, value, style: str = None) -> None:
+        """
+        Queue a value for writing at the end of this loop iteration.
+        Plain text is styled with the AutoFormat if `style` is given,
+        e.g. `write('failed', style='err')`.
+        """
+        if style is not None:
+            value = getattr(self.af(value), style)
+        colored, plain = split(value, self.encoding)
+        self._segments.extend(colored if self.color else plain)
+        if not self._scheduled:
+            self._scheduled = True
+            _running_loop().call_soon(self._write_pending)
+
+    def _write_pending(self) -> None:
+        self._scheduled = False
+        segments = self._segments
+        if segments:
+            self._segments = []
+            self.writer.write(b''.join(segments))
+
+    async def drain(self) -> None:
+        """
+        Write what is queued and wait until the transport
+        buffer is below its high-water mark.
+        """
+        self._write_pending()
+        await self.writer.drain()
+
+    async def close(self) -> None:
+        """
+        Write what is queued, then close the StreamWriter if owned.
+        """
+        await self.drain()
+        if not self.owns:
+            return
+        pipe = self.writer.get_extra_info('pipe')
+        if pipe is not None:
+            # The duplicate shares blocking mode with the original descriptor.
+            os.set_blocking(pipe.fileno(), True)
+        self.writer.close()
+        # Let the transport finish closing, StreamWriter.wait_closed()
+        # is not available before Python 3.7.
+        await asyncio.sleep(0)
+
+
+class _FileWriter(object):
+    """
+    StreamWriter stand-in for a regular file, writing right away.
+    """
+
+    def __init__(self, file) -> None:
+        self.file = file
+
+    def write(self, data: bytes) -> None:
+        self.file.write(data)
+        self.file.flush()
+
+    def get_extra_info(self, name: str, default=None):
+        return self.file if name == 'pipe' else default
+
+    async def drain(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.file.close()
+
+
+async def open_writer(file=None, af=None, color: bool = None,
+                      encoding: str = 'utf-8') -> AsyncWriter:
+    """
+    AsyncWriter for a duplicate of the file descriptor of a file object,
+    `sys.stdout` by default. Text already written to the file object
+    is flushed first. Regular files are written to directly,
+    the event loop cannot wait for them.
+    """
+    file = sys.stdout if file is None else file
+    file.flush()
+    pipe = os.fdopen(os.dup(file.fileno()), 'wb')
+    if stat.S_ISREG(os.fstat(pipe.fileno()).st_mode):
+        return AsyncWriter(_FileWriter(pipe), af=af, color=color,
+                           encoding=encoding, owns=True)
+    loop = _running_loop()
+    try:
+        transport, protocol = await loop.connect_write_pipe(
+                asyncio.streams.FlowControlMixin, pipe)
+    except BaseException:
+        pipe.close()
+        raise
+    writer = asyncio.StreamWriter(transport, protocol, None, loop)
+    return AsyncWriter(writer, af=af, color=color, encoding=encoding,
+                       owns=True)
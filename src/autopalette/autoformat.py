@@ -1,163 +1,411 @@
+from typing import Dict, List
+
 import sys
 
 import os
-import sty
+
+import re
 
 from autopalette import BasicTheme
+from autopalette.cache import LRUDict, RenderCache
 from autopalette.colormatch import ColorPoint
-from autopalette.colortrans import rgb2short
+from autopalette.fastcolor import FastColor, ansi256
+from autopalette.style import (
+    EMPTY,
+    BOLD,
+    DIM,
+    ITALIC,
+    UNDERLINE,
+    INVERSE,
+    Style,
+)
+from autopalette.handoff import (
+    HANDOFF_VARIABLE,
+    encode_handoff,
+    read_handoff,
+)
 from autopalette.utils import (
     terminal_colors,
     select_render_engine,
     parse_color,
     select_palette,
 )
-
-
-class ColoredString(str):
-    def __new__(cls, body, theme, key='', term_colors=0):
-        return super().__new__(cls, body)
-
-    def __init__(self, body, theme, key='', term_colors=0):
-        super().__init__()
-        self.theme = theme
-        self.key = key
-        self.render = self.theme.renderer.render
-        self._render = self.theme.renderer._render
-        self.term_colors = term_colors
-
-    @property
-    def _raw(self):
-        return super().__repr__()
-
-    @property
-    def _body(self):
-        return super().__str__()
-
-    def copy(self, body):
-        return ColoredString(body, theme=self.theme)
+from autopalette.width import clusters, text_width
+
+# Printable ASCII text, tabs and newlines, without '&' (HTML entities):
+# nothing for ftfy to fix and no emoji to replace.
+PLAIN_TEXT = re.compile('[\t\n -%\'-~]*\\Z')
+# Characters found in emoji, a superset is fine:
+# text without any of them is not passed to emoji2text.
+EMOJI = re.compile('[\u00a9\u00ae\u203c\u2049\u20e3\u2122-\u2b55'
+                   '\u3030\u303d\u3297\u3299\ufe0f\U0001f000-\U0001faff]')
+# Upper bound for cached results of text and emoji fixes.
+MAX_FIXED = 1024
+
+
+class StyleShortcuts(object):
+    """
+    Style properties shared by eager and lazy styled strings,
+    subclasses provide `styled()`, `plain`, `key`, `theme`
+    and `term_colors`.
+    """
+    __slots__ = ()
+
+    def styled(self, name, make_style, plain: str = None):
+        raise NotImplementedError()
 
     @property
     def id(self):
-        if self.key:
-            color = parse_color(self.key)
-        else:
-            color = parse_color(self._body)
-        text = self.render(self._body, fg=color)
-        return self.copy(text)
+        def make_style():
+            color = parse_color(self.key or self.plain)
+            return self.theme.renderer.style(color)
+
+        return self.styled('id', make_style)
 
     @property
     def id256(self):
         if self.term_colors == 0:
-            return self.copy(self._body)
-        if self.key:
-            color = parse_color(self.key)
-        else:
-            color = parse_color(self._body)
-        ansi = int(rgb2short(color.hex_l)[0])
-        match = ColorPoint(source=color, target=color, ansi=ansi)
-        text = self._render(self._body, fg=match)
-        return self.copy(text)
+            return self
+
+        def make_style():
+            color = FastColor.of(parse_color(self.key or self.plain))
+            match = ColorPoint(source=color, target=color, ansi=ansi256(color))
+            return self.theme.renderer._style(match)
+
+        return self.styled('id256', make_style)
 
     @property
     def p(self):
-        text = self.theme.base(self._body)
-        return self.copy(text)
+        return self.styled('p', lambda: self.theme.base.style)
 
     @property
     def light(self):
-        text = self.theme.light(self._body)
-        return self.copy(text)
+        return self.styled('light', lambda: self.theme.light.style)
 
     @property
     def dark(self):
-        text = self.theme.dark(self._body)
-        return self.copy(text)
+        return self.styled('dark', lambda: self.theme.dark.style)
 
     @property
     def h1(self):
-        text = self.theme.h1(self._body)
-        return self.copy(text)
+        return self.styled('h1', lambda: self.theme.h1.style)
 
     @property
     def h2(self):
-        text = self.theme.h2(self._body)
-        return self.copy(text)
+        return self.styled('h2', lambda: self.theme.h2.style)
 
     @property
     def h3(self):
-        text = self.theme.h3(self._body)
-        return self.copy(text)
+        return self.styled('h3', lambda: self.theme.h3.style)
 
     @property
     def h4(self):
-        text = self.theme.h4(self._body)
-        return self.copy(text)
+        return self.styled('h4', lambda: self.theme.h4.style)
 
     @property
     def li(self):
-        text = self.theme.light('- ' + self._body)
-        return self.copy(text)
+        return self.styled('li', lambda: self.theme.light.style,
+                           plain='- ' + self.plain)
 
     @property
     def err(self):
-        text = self.theme.error(self._body)
-        return self.copy(text)
+        return self.styled('err', lambda: self.theme.error.style)
 
     @property
     def warn(self):
-        text = self.theme.warning(self._body)
-        return self.copy(text)
+        return self.styled('warn', lambda: self.theme.warning.style)
 
     @property
     def info(self):
-        text = self.theme.info(self._body)
-        return self.copy(text)
+        return self.styled('info', lambda: self.theme.info.style)
 
     @property
     def ok(self):
-        text = self.theme.ok(self._body)
-        return self.copy(text)
+        return self.styled('ok', lambda: self.theme.ok.style)
+
+    def effect(self, name, flag):
+        if terminal_colors() == 0:
+            return self
+        return self.styled(name, lambda: Style(flag))
 
     @property
     def b(self):
-        if terminal_colors() == 0:
-            return self.copy(self._body)
-        text = self._body
-        text = sty.ef.bold + text + sty.rs.all
-        return self.copy(text)
+        return self.effect('b', BOLD)
 
     @property
     def i(self):
-        if terminal_colors() == 0:
-            return self.copy(self._body)
-        text = self._body
-        text = sty.ef.italic + text + sty.rs.all
-        return self.copy(text)
+        return self.effect('i', ITALIC)
 
     @property
     def u(self):
-        if terminal_colors() == 0:
-            return self.copy(self._body)
-        text = self._body
-        text = sty.ef.underl + text + sty.rs.all
-        return self.copy(text)
+        return self.effect('u', UNDERLINE)
 
     @property
     def r(self):
-        if terminal_colors() == 0:
-            return self.copy(self._body)
-        text = self._body
-        text = sty.ef.inverse + text + sty.rs.all
-        return self.copy(text)
+        return self.effect('r', INVERSE)
 
     @property
     def m(self):
-        if terminal_colors() == 0:
-            return self.copy(self._body)
-        text = self._body
-        text = sty.ef.dim + text + sty.rs.all
-        return self.copy(text)
+        return self.effect('m', DIM)
+
+    def segments(self, encoding='utf-8'):
+        return self.style.segments(self.plain.encode(encoding))
+
+    def render_bytes(self, encoding='utf-8') -> bytes:
+        return self.style.render_bytes(self.plain, encoding=encoding)
+
+
+class TextLayout(object):
+    """
+    Alignment by visible width for styled strings that know their
+    plain text and style: padding, truncation and wrapping work on the
+    plain text and render it once with the same style, escape sequences
+    are never scanned. Padding is styled along with the text.
+
+    The width is measured once and carried over when restyling.
+
+    >>> from autopalette.render import Ansi256Renderer
+    >>> af = AutoFormat(term_colors=256, renderer=Ansi256Renderer)
+    >>> name = af('日本').ok
+    >>> name.width, len(name)
+    (4, 16)
+    >>> name.ljust(6)
+    '\\x1b[38;5;28m日本  \\x1b[0m'
+    >>> name.ljust(6).width, af('status: degraded').err.truncate(10).plain
+    (6, 'status: d…')
+    >>> [line.plain for line in af('one two three').wrap(7)]
+    ['one two', 'three']
+    """
+    __slots__ = ()
+
+    def with_plain(self, plain: str, width: int = None):
+        raise NotImplementedError()
+
+    @property
+    def width(self) -> int:
+        if self._width is None:
+            self._width = text_width(self.plain)
+        return self._width
+
+    def ljust(self, width: int, fillchar: str = ' '):
+        missing = width - self.width
+        if missing <= 0:
+            return self
+        return self.with_plain(self.plain + fillchar * missing, width)
+
+    def rjust(self, width: int, fillchar: str = ' '):
+        missing = width - self.width
+        if missing <= 0:
+            return self
+        return self.with_plain(fillchar * missing + self.plain, width)
+
+    def center(self, width: int, fillchar: str = ' '):
+        missing = width - self.width
+        if missing <= 0:
+            return self
+        left = missing // 2
+        return self.with_plain(fillchar * left + self.plain
+                               + fillchar * (missing - left), width)
+
+    def truncate(self, width: int, placeholder: str = '…'):
+        """
+        Cut to at most `width` cells, ending with `placeholder` if cut.
+        """
+        if self.width <= width:
+            return self
+        placeholder_width = text_width(placeholder)
+        if placeholder_width > width:
+            placeholder, placeholder_width = '', 0
+        room = width - placeholder_width
+        parts = []
+        used = 0
+        for cluster, cells in clusters(self.plain):
+            if used + cells > room:
+                break
+            parts.append(cluster)
+            used += cells
+        return self.with_plain(''.join(parts) + placeholder,
+                               used + placeholder_width)
+
+    def wrap(self, width: int) -> list:
+        """
+        Lines of at most `width` cells, broken at spaces
+        and inside words longer than a line.
+        """
+        lines = []
+        for paragraph in self.plain.split('\n'):
+            line = []  # type: List[str]
+            line_width = 0
+            for word in paragraph.split():
+                word_width = text_width(word)
+                if line and line_width + 1 + word_width <= width:
+                    line.append(' ' + word)
+                    line_width += 1 + word_width
+                    continue
+                if line:
+                    lines.append((''.join(line), line_width))
+                line, line_width = [], 0
+                if word_width > width:
+                    for cluster, cells in clusters(word):
+                        if line and line_width + cells > width:
+                            lines.append((''.join(line), line_width))
+                            line, line_width = [], 0
+                        line.append(cluster)
+                        line_width += cells
+                else:
+                    line, line_width = [word], word_width
+            lines.append((''.join(line), line_width))
+        return [self.with_plain(text, cells) for text, cells in lines]
+
+
+class ColoredString(StyleShortcuts, TextLayout, str):
+    """
+    String rendered with a style, remembers the plain text and style
+    it was rendered from so that chained styles combine into
+    a single escape sequence instead of nesting.
+
+    >>> from autopalette.render import Ansi256Renderer
+    >>> af = AutoFormat(term_colors=256, renderer=Ansi256Renderer)
+    >>> af(123).h1, af(3.5).id256.plain
+    ('\\x1b[38;5;16;48;5;226m123\\x1b[0m', '3.5')
+    """
+
+    def __new__(cls, body, theme, key='', term_colors=0, cache=None,
+                plain=None, style=EMPTY, width=None):
+        return super().__new__(cls, body)
+
+    def __init__(self, body, theme, key='', term_colors=0, cache=None,
+                 plain=None, style=EMPTY, width=None):
+        super().__init__()
+        self.theme = theme
+        self.key = key
+        self.render = self.theme.renderer.render
+        self._render = self.theme.renderer._render
+        self.term_colors = term_colors
+        self.cache = cache
+        self.plain = str.__str__(self) if plain is None else plain
+        self.style = style
+        self._width = width
+
+    @property
+    def _raw(self):
+        return super().__repr__()
+
+    @property
+    def _body(self):
+        return super().__str__()
+
+    def copy(self, body):
+        return ColoredString(body, theme=self.theme, key=self.key,
+                             term_colors=self.term_colors, cache=self.cache)
+
+    def restyle(self, style: Style, plain: str = None):
+        """
+        Combine `style` with the current style and render plain text once.
+        """
+        width = self._width if plain is None else None
+        plain = self.plain if plain is None else plain
+        style = self.style | style
+        return ColoredString(style(plain), theme=self.theme, key=self.key,
+                             term_colors=self.term_colors, cache=self.cache,
+                             plain=plain, style=style, width=width)
+
+    def with_plain(self, plain: str, width: int = None):
+        return ColoredString(self.style(plain), theme=self.theme,
+                             key=self.key, term_colors=self.term_colors,
+                             cache=self.cache, plain=plain,
+                             style=self.style, width=width)
+
+    def styled(self, name, make_style, plain: str = None):
+        """
+        Apply style returned by `make_style`,
+        going through the render cache if set.
+        """
+        if self.cache is None:
+            return self.restyle(make_style(), plain)
+        return self.cache.get(self.plain, (name, self.key, self.style),
+                              self.theme.renderer,
+                              lambda: self.restyle(make_style(), plain))
+
+    @property
+    def raw(self):
+        return repr(self)
+
+
+class LazyString(StyleShortcuts, TextLayout):
+    """
+    Styled text that only accumulates style intent,
+    rendering happens once when converted to `str`,
+    formatted or written.
+
+    It is not a `str` subclass: it supports `len()`, `+`, comparison
+    and formatting, but APIs that require a `str`, like `str.join()`
+    or `re`, need `str(text)` first.
+
+    >>> from autopalette.render import Ansi256Renderer
+    >>> theme = BasicTheme(renderer=Ansi256Renderer)
+    >>> text = LazyString('hi', theme, term_colors=256).h1.u
+    >>> text.style
+    Style(effects=0, fg=16, bg=226)
+    >>> '{:>4}'.format(LazyString('hi', theme))
+    '  hi'
+    >>> lazy = LazyString('hi', theme, term_colors=256).h1
+    >>> len(lazy), ', '.join([str(lazy), 'x'])
+    (25, '\\x1b[38;5;16;48;5;226mhi\\x1b[0m, x')
+    >>> af = AutoFormat(term_colors=256, renderer=Ansi256Renderer, lazy=True)
+    >>> str(af(3).h1), str(af(3)), af(3).ljust(2).width
+    ('\\x1b[38;5;16;48;5;226m3\\x1b[0m', '3', 2)
+    """
+    __slots__ = ('plain', 'style', 'theme', 'key', 'term_colors',
+                 '_text', '_width')
+
+    def __init__(self, plain, theme, key='', term_colors=0, style=EMPTY,
+                 width=None):
+        self.plain = plain if isinstance(plain, str) else str(plain)
+        self.style = style
+        self.theme = theme
+        self.key = key
+        self.term_colors = term_colors
+        self._text = None
+        self._width = width
+
+    def styled(self, name, make_style, plain: str = None):
+        return LazyString(self.plain if plain is None else plain,
+                          self.theme, key=self.key,
+                          term_colors=self.term_colors,
+                          style=self.style | make_style(),
+                          width=self._width if plain is None else None)
+
+    def with_plain(self, plain: str, width: int = None):
+        return LazyString(plain, self.theme, key=self.key,
+                          term_colors=self.term_colors,
+                          style=self.style, width=width)
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = self.style(self.plain)
+        return self._text
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+    def __format__(self, format_spec: str) -> str:
+        return format(str(self), format_spec)
+
+    def __len__(self) -> int:
+        return len(str(self))
+
+    def __add__(self, other) -> str:
+        return str(self) + other
+
+    def __radd__(self, other) -> str:
+        return other + str(self)
+
+    def __eq__(self, other) -> bool:
+        return str(self) == other
+
+    def __hash__(self) -> int:
+        return hash(str(self))
 
     @property
     def raw(self):
@@ -167,11 +415,14 @@ class ColoredString(str):
 class AutoFormat(object):
     def __init__(self, term_colors=0,
                  renderer=None, palette=None,
-                 theme=None):
+                 theme=None, cache=None, lazy=False, compact=False):
         self.init(term_colors=term_colors,
                   renderer=renderer,
                   palette=palette,
-                  theme=theme)
+                  theme=theme,
+                  cache=cache,
+                  lazy=lazy,
+                  compact=compact)
 
     def init(self,
              term_colors=0,
@@ -179,7 +430,16 @@ class AutoFormat(object):
              palette=None,
              theme=None,
              fix_all=False,
-             fix_text=False):
+             fix_text=False,
+             cache=None,
+             lazy=False,
+             compact=False):
+        if not term_colors:
+            handoff = read_handoff(sys.stdout)
+            if handoff:
+                term_colors = handoff[0]
+                renderer = renderer or handoff[1]
+                palette = palette or handoff[2]
         self.term_colors = term_colors or terminal_colors(sys.stdout)
         self.renderer = renderer or select_render_engine(self.term_colors)
         self.palette = palette or select_palette(self.term_colors)
@@ -187,8 +447,23 @@ class AutoFormat(object):
                            renderer=self.renderer) if theme else BasicTheme(
                 palette=self.palette,
                 renderer=self.renderer)
+        self.theme.renderer.compact = compact
+        if cache is True:
+            cache = RenderCache()
+        elif cache is False:
+            cache = None
+        self.cache = cache
+        self.lazy = lazy
+        from autopalette.template import TemplateCache
+        from autopalette.markup import Markup
+        self._templates = TemplateCache(self)
+        self._markup = Markup(self)
         self._need_text_fix = self.need_text_fix()
         self._need_emoji_fix = self.need_emoji_fix()
+        self._fixed = LRUDict(MAX_FIXED)  # type: Dict[str, str]
+        cls = type(self)
+        self._fix_text_overridden = cls.fix_text is not AutoFormat.fix_text
+        self._fix_emoji_overridden = cls.fix_emoji is not AutoFormat.fix_emoji
         if fix_all and self._need_emoji_fix:
             fix_text = True
             try:
@@ -203,6 +478,18 @@ class AutoFormat(object):
             except ImportError:
                 raise ImportError('Please install python package: ftfy')
 
+    def export_env(self, environ=None) -> str:
+        """
+        Export resolved terminal colors, renderer and palette
+        into the environment, so that child processes inheriting it
+        can skip terminal detection and reading configuration.
+        """
+        environ = os.environ if environ is None else environ
+        value = encode_handoff(self.term_colors, self.renderer,
+                               self.palette, environ)
+        environ[HANDOFF_VARIABLE] = value
+        return value
+
     def need_text_fix(self):
         if 0 <= self.term_colors <= 16:
             return True
@@ -219,9 +506,101 @@ class AutoFormat(object):
     def fix_emoji(self, text, sep):
         return text
 
-    def __call__(self, content, *, key=''):
-        if self._need_text_fix:
+    def fix(self, content):
+        """
+        Fix text and emoji for terminals that need it, if fixing
+        is enabled. Plain ASCII text is returned as is, fixed results
+        for other strings are cached.
+
+        >>> af = AutoFormat(term_colors=16)
+        >>> af.fix_emoji = lambda text, sep: text.replace('💛', sep + 'heart' + sep)
+        >>> af.fix('plain log line'), af.fix('I 💛 Unicode!')
+        ('plain log line', 'I :heart: Unicode!')
+        >>> af = AutoFormat(term_colors=16)
+        >>> af.fix('I 💛 Unicode!'), len(af._fixed)
+        ('I 💛 Unicode!', 0)
+        """
+        # Fix functions are installed on the instance by `init`
+        # (or assigned), or overridden in a subclass.
+        installed = self.__dict__
+        fix_text = self._need_text_fix and ('fix_text' in installed
+                                            or self._fix_text_overridden)
+        fix_emoji = self._need_emoji_fix and ('fix_emoji' in installed
+                                              or self._fix_emoji_overridden)
+        if not (fix_text or fix_emoji):
+            return content
+        if not isinstance(content, str):
+            return self._fix(content, fix_text, fix_emoji)
+        if PLAIN_TEXT.match(content):
+            return content
+        try:
+            return self._fixed[content]
+        except KeyError:
+            pass
+        fixed = self._fixed[content] = self._fix(content, fix_text, fix_emoji)
+        return fixed
+
+    def _fix(self, content, fix_text: bool, fix_emoji: bool):
+        if fix_text:
             content = self.fix_text(content)
-        if self._need_emoji_fix:
+        if fix_emoji and (not isinstance(content, str)
+                          or EMOJI.search(content)):
             content = self.fix_emoji(content, ':')
-        return ColoredString(content, theme=self.theme, key=key, term_colors=self.term_colors)
+        return content
+
+    def template(self, template: str):
+        """
+        Compile a format string with per-field styles,
+        see `autopalette.template`.
+        """
+        return self._templates.get(template)
+
+    def format(self, template: str, *args, **kwargs) -> str:
+        return self._templates.get(template).format(*args, **kwargs)
+
+    def markup(self, source: str) -> str:
+        """
+        Render inline markup, e.g. '[h1]Title[/h1] [err]failed[/err]',
+        see `autopalette.markup`.
+        """
+        return self._markup.render(source)
+
+    def gradient(self, stops=None, steps=16, low=0.0, high=1.0):
+        """
+        Build a color ramp for values, see `autopalette.gradient`.
+        """
+        from autopalette.gradient import Gradient, HEALTH_STOPS
+        return Gradient(self, stops=stops or HEALTH_STOPS,
+                        steps=steps, low=low, high=high)
+
+    def sparkline(self, width=40, low=None, high=None, **kwargs):
+        from autopalette.chart import Sparkline
+        return Sparkline(self, width=width, low=low, high=high, **kwargs)
+
+    def bar(self, width=20, low=0, high=1, **kwargs):
+        from autopalette.chart import Bar
+        return Bar(self, width=width, low=low, high=high, **kwargs)
+
+    def image(self, dither=None, **kwargs):
+        from autopalette.image import ImageRenderer
+        return ImageRenderer(self, dither=dither, **kwargs)
+
+    def colorizer(self, rules=None, **kwargs):
+        """
+        Colorize text with regular expression rules,
+        see `autopalette.colorize`.
+        """
+        from autopalette.colorize import Colorizer
+        return Colorizer(self, rules=rules, **kwargs)
+
+    def live(self, stream=None, min_interval=0.05):
+        from autopalette.live import LiveRegion
+        return LiveRegion(stream=stream, min_interval=min_interval)
+
+    def __call__(self, content, *, key=''):
+        content = self.fix(content)
+        if self.lazy:
+            return LazyString(content, theme=self.theme, key=key,
+                              term_colors=self.term_colors)
+        return ColoredString(content, theme=self.theme, key=key,
+                             term_colors=self.term_colors, cache=self.cache)
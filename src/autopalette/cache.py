@@ -0,0 +1,138 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+import threading
+
+
+class RenderCache(object):
+    """
+    Bounded LRU cache of fully rendered strings,
+    keyed by (text, style, renderer).
+
+    Size is capped both in number of entries and in bytes,
+    counted as the length of the source text plus rendered output.
+    Texts longer than `max_text_length` bypass the cache entirely.
+    Safe to share between threads, rendering happens outside the lock.
+
+    >>> cache = RenderCache(max_entries=2)
+    >>> cache.get('ERROR', 'err', None, lambda: '<ERROR>')
+    '<ERROR>'
+    >>> cache.get('ERROR', 'err', None, lambda: '<ERROR>')
+    '<ERROR>'
+    >>> cache.hits, cache.misses
+    (1, 1)
+    >>> _ = cache.get('a', 'ok', None, str)
+    >>> _ = cache.get('b', 'ok', None, str)
+    >>> len(cache)
+    2
+    >>> cache.get('x' * 1000, 'ok', None, lambda: 'long')
+    'long'
+    >>> cache.bypassed
+    1
+    """
+
+    def __init__(self,
+                 max_entries: int = 1024,
+                 max_bytes: int = 1 << 20,
+                 max_text_length: int = 256) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_text_length = max_text_length
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, text: str, style: Hashable, renderer: Any,
+            render: Callable[[], str]) -> str:
+        if len(text) > self.max_text_length:
+            self.bypassed += 1
+            return render()
+        key = (text, style, renderer)
+        entries = self._entries
+        with self._lock:
+            try:
+                value = entries[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                entries.move_to_end(key)
+                return value
+        value = render()
+        with self._lock:
+            if key in entries:
+                # Rendered by another thread meanwhile, keep its value.
+                entries.move_to_end(key)
+                return entries[key]
+            entries[key] = value
+            self.size += len(text) + len(value)
+            while (len(entries) > self.max_entries
+                   or self.size > self.max_bytes) and entries:
+                (old_text, _, _), old_value = entries.popitem(last=False)
+                self.size -= len(old_text) + len(old_value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+            self.bypassed = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        return {
+            'entries':  len(self._entries),
+            'bytes':    self.size,
+            'hits':     self.hits,
+            'misses':   self.misses,
+            'bypassed': self.bypassed,
+            'hit_rate': self.hit_rate,
+        }
+
+
+class LRUDict(OrderedDict):
+    """
+    Dict holding at most `max_entries` items, evicting the least
+    recently used ones instead of emptying when full.
+
+    Lookups with `d[key]` count as use, `key in d` does not.
+    Concurrent use from several threads may turn a hit into
+    a KeyError, callers treat it as a miss.
+
+    >>> cache = LRUDict(max_entries=2)
+    >>> cache['a'], cache['b'] = 1, 2
+    >>> cache['a']
+    1
+    >>> cache['c'] = 3
+    >>> sorted(cache), 'b' in cache
+    (['a', 'c'], False)
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+
+    def __getitem__(self, key):
+        value = OrderedDict.__getitem__(self, key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        OrderedDict.__setitem__(self, key, value)
+        try:
+            while len(self) > self.max_entries:
+                self.popitem(last=False)
+        except KeyError:  # evicted by another thread meanwhile
+            pass
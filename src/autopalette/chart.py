@@ -0,0 +1,191 @@
+"""
+Sparklines and horizontal bars drawn with block characters,
+colored through precomputed palette ramps (see `autopalette.gradient`).
+
+Every glyph is rendered once per color level up front,
+so appending a sample to a `Sparkline` or drawing a `Bar`
+is a table lookup rather than a render call.
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+from autopalette.gradient import Gradient, HEALTH_STOPS, Number
+
+SPARK_BLOCKS = '▁▂▃▄▅▆▇█'
+BAR_EIGHTHS = ' ▏▎▍▌▋▊▉'
+FULL_BLOCK = '█'
+
+INFINITY = float('inf')
+
+
+class Sparkline(object):
+    """
+    Ring buffer of the latest `width` samples,
+    drawn as a line of block characters colored by value.
+
+    A bound that is not given grows to fit samples, a given bound
+    stays fixed; cells are re-rendered only when the range grows.
+    NaN samples are drawn as blank cells. Infinities do not grow
+    the range, they are drawn at its nearest end, or blank until
+    a finite sample sets the range.
+
+    >>> from autopalette import AutoFormat, AnsiNoColorRenderer
+    >>> af = AutoFormat(renderer=AnsiNoColorRenderer)
+    >>> spark = af.sparkline(width=4, low=0, high=8)
+    >>> spark.extend([0, 2, 4, 8, 7.9])
+    >>> str(spark)
+    '▃▅██'
+    >>> spark = af.sparkline(width=4, low=0)
+    >>> spark.extend([4, 8])
+    >>> str(spark), spark.low, spark.high
+    ('▅█', 0, 8)
+    >>> spark = af.sparkline(width=4, high=10)
+    >>> spark.extend([4, 6])
+    >>> str(spark), spark.low, spark.high
+    ('▁▃', 4, 10)
+    >>> spark.append(float('nan'))
+    >>> str(spark)
+    '▁▃ '
+    >>> spark.extend([float('inf'), float('-inf')])
+    >>> str(spark), spark.low, spark.high
+    ('▃ █▁', 4, 10)
+    >>> spark = af.sparkline(width=4)
+    >>> spark.append(float('inf'))
+    >>> spark.extend([1, 2])
+    >>> str(spark)
+    '█▁█'
+    """
+
+    def __init__(self, af, width: int = 40,
+                 low: Optional[Number] = None,
+                 high: Optional[Number] = None,
+                 stops=HEALTH_STOPS) -> None:
+        self.af = af
+        self.width = width
+        self.stops = stops
+        self._fixed_low = low is not None
+        self._fixed_high = high is not None
+        self._fixed = self._fixed_low and self._fixed_high
+        self.low = low
+        self.high = high
+        self._samples = deque(maxlen=width)
+        self._cells = deque(maxlen=width)
+        self._line = None  # type: Optional[str]
+        self._glyphs = []  # type: List[str]
+        self._gradient = None  # type: Optional[Gradient]
+        if self._fixed:
+            self._build()
+
+    def _build(self) -> None:
+        high = self.high if self.high != self.low else self.low + 1
+        self._gradient = Gradient(self.af, stops=self.stops,
+                                  steps=len(SPARK_BLOCKS),
+                                  low=self.low, high=high)
+        gradient = self._gradient
+        self._glyphs = [prefix + block + suffix for prefix, block, suffix
+                        in zip(gradient.prefixes, SPARK_BLOCKS,
+                               gradient.suffixes)]
+        self._glyphs.append(' ')  # at NAN_INDEX, for NaN samples
+
+    def _fit(self, value: Number) -> None:
+        low, high = self.low, self.high
+        if not self._fixed_low:
+            low = value if low is None else min(low, value)
+        if not self._fixed_high:
+            high = value if high is None else max(high, value)
+            high = max(high, low)
+        if not self._fixed_low:
+            low = min(low, high)
+        if self._gradient is not None and (low, high) == (self.low, self.high):
+            return
+        self.low, self.high = low, high
+        self._build()
+        index = self._gradient.index
+        glyphs = self._glyphs
+        self._cells = deque((glyphs[index(sample)] for sample in self._samples),
+                            maxlen=self.width)
+
+    def append(self, value: Number) -> None:
+        if value != value:
+            self._samples.append(value)
+            self._cells.append(' ')
+            self._line = None
+            return
+        if not self._fixed and abs(value) != INFINITY:
+            self._fit(value)
+        self._samples.append(value)
+        if self._gradient is None:  # only infinities so far
+            self._cells.append(' ')
+        else:
+            self._cells.append(self._glyphs[self._gradient.index(value)])
+        self._line = None
+
+    def extend(self, values: Iterable[Number]) -> None:
+        for value in values:
+            self.append(value)
+
+    def __str__(self) -> str:
+        if self._line is None:
+            self._line = ''.join(self._cells)
+        return self._line
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class Bar(object):
+    """
+    Horizontal bar `width` cells wide with eighth-cell resolution,
+    colored by value.
+
+    >>> from autopalette import AutoFormat, AnsiNoColorRenderer
+    >>> af = AutoFormat(renderer=AnsiNoColorRenderer)
+    >>> bar = af.bar(width=4, low=0, high=100)
+    >>> '|{}|'.format(bar(50)), '|{}|'.format(bar(55))
+    ('|██  |', '|██▏ |')
+    >>> '|{}|'.format(bar(float('inf'))), '|{}|'.format(bar(float('-inf')))
+    ('|████|', '|    |')
+    >>> af.bar(low=1, high=1)
+    Traceback (most recent call last):
+    ...
+    ValueError: Gradient range is empty: 1..1
+    """
+
+    def __init__(self, af, width: int = 20,
+                 low: Number = 0, high: Number = 1,
+                 stops=HEALTH_STOPS, steps: int = 8) -> None:
+        self._gradient = Gradient(af, stops=stops, steps=steps,
+                                  low=low, high=high)
+        self.width = width
+        self.low = low
+        self.high = high
+        self._eighths = width * 8
+        self._scale = self._eighths / (high - low)
+        # Rendered bars by (color level, length in eighths of a cell).
+        self._bars = {}  # type: Dict[tuple, str]
+
+    def __call__(self, value: Number) -> str:
+        if value != value:
+            return ' ' * self.width
+        # Clamp before int(), which fails on infinities.
+        scaled = (value - self.low) * self._scale
+        if scaled < 0:
+            eighths = 0
+        elif scaled >= self._eighths:
+            eighths = self._eighths
+        else:
+            eighths = int(scaled)
+        level = self._gradient.index(value)
+        key = (level, eighths)
+        try:
+            return self._bars[key]
+        except KeyError:
+            pass
+        full, partial = divmod(eighths, 8)
+        text = FULL_BLOCK * full + BAR_EIGHTHS[partial].strip()
+        padding = ' ' * (self.width - len(text))
+        if text:
+            gradient = self._gradient
+            text = gradient.prefixes[level] + text + gradient.suffixes[level]
+        bar = self._bars[key] = text + padding
+        return bar
@@ -0,0 +1,203 @@
+"""
+Colorize log text with regular expression rules.
+
+    colorizer = af.colorizer([(r'\\bERROR\\b', 'err'), (r'took \\d+ms', 'b.warn')])
+    print(colorizer.line('ERROR: request took 1200ms'))
+
+Rules are (pattern, styles) pairs, styles are dotted chains of static
+style names as in templates. They are compiled once into a single
+regular expression and the text to put around each match; where
+patterns overlap at a position, the first rule wins.
+
+`colorize_file()` colorizes large files on several processes: the input
+is split at line boundaries into chunks, workers receive the compiled
+rules once when they start and chunks are written strictly in input
+order, with at most `max_in_flight` chunks read ahead. Rules are
+rendered in the parent, workers only substitute strings.
+
+Workers are forked while the process runs a single thread, as
+forked children start with the parent's state. With other threads
+alive, e.g. a `QueueHandler`, or on macOS, they are spawned instead:
+the colorizer's capabilities are handed to them as a handoff value
+(see `autopalette.handoff`) for AutoFormat instances created in them,
+the parent's environment is left unchanged. Spawned workers still
+resolve the package's `af` when importing autopalette, unless the
+parent exported it with `af.export_env()` before starting threads.
+"""
+from collections import deque
+from typing import BinaryIO, List, Optional, Sequence, Tuple
+
+import multiprocessing
+import os
+import re
+import sys
+import threading
+
+from autopalette.handoff import HANDOFF_VARIABLE, encode_handoff
+from autopalette.template import DYNAMIC_STYLES, STYLE_NAMES, render_affixes
+
+Rule = Tuple[str, str]
+
+LOG_RULES = [
+    (r'\b(?:ERROR|CRITICAL|FATAL|Traceback)\b', 'err'),
+    (r'\bWARN(?:ING)?\b', 'warn'),
+    (r'\bINFO\b', 'info'),
+    (r'\bDEBUG\b', 'dark'),
+    (r'^\d{4}-\d\d-\d\d[ T][\d:.,]+', 'dark'),
+    (r'\b\d{1,3}(?:\.\d{1,3}){3}\b', 'light'),
+]
+
+CHUNK_SIZE = 1 << 20
+
+# (pattern, (prefix, suffix) per rule), set in worker processes.
+_compiled = None  # type: Optional[tuple]
+
+
+def _substitute(text: str, pattern, wrappers: Sequence[Tuple[str, str]]) -> str:
+    def wrap(match):
+        prefix, suffix = wrappers[int(match.lastgroup[1:])]
+        return prefix + match.group() + suffix
+
+    return pattern.sub(wrap, text)
+
+
+def _init_worker(source: str, flags: int,
+                 wrappers: Sequence[Tuple[str, str]],
+                 handoff: Optional[str]) -> None:
+    global _compiled
+    _compiled = (re.compile(source, flags), wrappers)
+    if handoff:
+        os.environ[HANDOFF_VARIABLE] = handoff
+
+
+def _colorize_chunk(chunk: bytes, encoding: str) -> bytes:
+    pattern, wrappers = _compiled
+    text = chunk.decode(encoding, 'surrogateescape')
+    return _substitute(text, pattern, wrappers).encode(encoding, 'surrogateescape')
+
+
+def read_chunks(infile: BinaryIO, chunk_size: int = CHUNK_SIZE):
+    """
+    Blocks of about `chunk_size` bytes of a binary file,
+    ending at line boundaries. Lines longer than `chunk_size`
+    are split every `chunk_size` bytes.
+
+    >>> import io
+    >>> list(read_chunks(io.BytesIO(b'one\\ntwo\\nthree'), chunk_size=5))
+    [b'one\\n', b'two\\n', b'three']
+    >>> list(read_chunks(io.BytesIO(b'abcdefg\\nh'), chunk_size=3))
+    [b'abc', b'def', b'g\\n', b'h']
+    """
+    rest = b''
+    while True:
+        block = infile.read(chunk_size)
+        if not block:
+            break
+        end = block.rfind(b'\n') + 1
+        if end:
+            yield rest + block[:end]
+            rest = block[end:]
+        else:
+            rest += block
+            while len(rest) >= chunk_size:
+                yield rest[:chunk_size]
+                rest = rest[chunk_size:]
+    if rest:
+        yield rest
+
+
+def _pool_context():
+    """
+    Fork workers while no other threads are running, forking
+    a process with threads can deadlock the children on locks
+    held at the time. Spawn them otherwise, and on macOS.
+    """
+    if sys.platform != 'darwin' and threading.active_count() == 1 \
+            and 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context('spawn')
+
+
+class Colorizer(object):
+    """
+    >>> from autopalette import AutoFormat, Ansi256Renderer
+    >>> af = AutoFormat(term_colors=256, renderer=Ansi256Renderer)
+    >>> colorizer = af.colorizer([(r'\\bERROR\\b', 'err'), (r'\\d+ms', 'ok')])
+    >>> colorizer.line('ERROR after 120ms')
+    '\\x1b[38;5;231;48;5;196mERROR\\x1b[0m after \\x1b[38;5;28m120ms\\x1b[0m'
+    >>> import io
+    >>> infile = io.BytesIO(b'ok in 5ms\\n' * 3 + b'ERROR\\n')
+    >>> outfile = io.BytesIO()
+    >>> colorizer.colorize_file(infile, outfile, workers=2, chunk_size=16)
+    >>> outfile.getvalue().decode().splitlines()[-2:]
+    ['ok in \\x1b[38;5;28m5ms\\x1b[0m', '\\x1b[38;5;231;48;5;196mERROR\\x1b[0m']
+    """
+
+    def __init__(self, af, rules: Sequence[Rule] = None, flags: int = re.MULTILINE) -> None:
+        self.af = af
+        self.rules = list(LOG_RULES if rules is None else rules)
+        self.flags = flags
+        alternatives = []
+        self.wrappers = []  # type: List[Tuple[str, str]]
+        for index, (pattern, styles) in enumerate(self.rules):
+            re.compile(pattern, flags)  # report errors for the rule itself
+            alternatives.append('(?P<r{}>{})'.format(index, pattern))
+            self.wrappers.append(self._wrapper(styles))
+        self.source = '|'.join(alternatives) or '(?!)'
+        self.pattern = re.compile(self.source, flags)
+
+    def _wrapper(self, styles: str) -> Tuple[str, str]:
+        names = tuple(name for name in styles.split('.') if name)
+        unknown = set(names) - STYLE_NAMES
+        if unknown:
+            raise ValueError('Unknown style in colorize rule: {}'.format(
+                    ', '.join(sorted(unknown))))
+        dynamic = DYNAMIC_STYLES.intersection(names)
+        if dynamic:
+            raise ValueError('Styles depending on the matched text cannot be '
+                             'used in colorize rules: {}'.format(
+                    ', '.join(sorted(dynamic))))
+        return render_affixes(self.af, names)
+
+    def line(self, text: str) -> str:
+        return _substitute(text, self.pattern, self.wrappers)
+
+    def _handoff(self) -> Optional[str]:
+        af = self.af
+        try:
+            return encode_handoff(af.term_colors, af.renderer, af.palette)
+        except ValueError:  # custom renderer or palette
+            return None
+
+    def colorize_file(self, infile: BinaryIO, outfile: BinaryIO,
+                      workers: Optional[int] = None,
+                      chunk_size: int = CHUNK_SIZE,
+                      max_in_flight: Optional[int] = None,
+                      encoding: str = 'utf-8') -> None:
+        """
+        Colorize a binary file into another, on `workers` processes
+        (as many as CPUs by default, 1 colorizes in this process).
+        """
+        chunks = read_chunks(infile, chunk_size)
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            for chunk in chunks:
+                text = chunk.decode(encoding, 'surrogateescape')
+                outfile.write(self.line(text).encode(encoding, 'surrogateescape'))
+            return
+        max_in_flight = max_in_flight or 2 * workers
+        pool = _pool_context().Pool(workers, initializer=_init_worker,
+                                    initargs=(self.source, self.flags,
+                                              self.wrappers, self._handoff()))
+        try:
+            pending = deque()
+            for chunk in chunks:
+                if len(pending) >= max_in_flight:
+                    outfile.write(pending.popleft().get())
+                pending.append(pool.apply_async(_colorize_chunk,
+                                                (chunk, encoding)))
+            while pending:
+                outfile.write(pending.popleft().get())
+        finally:
+            pool.terminate()
+            pool.join()
@@ -4,21 +4,36 @@ import kdtree
 
 from colour import Color
 
+from autopalette.fastcolor import FastColor
+
 AnsiCodeType = Union[str, int, Tuple[int, int, int]]
 
 
 class ColorPoint(object):
+    __slots__ = ('_source', '_target', 'ansi')
+
     def __init__(self, source: Color, target: Color,
                  ansi: AnsiCodeType) -> None:
         """
         Map source color to target color, stores target
         ansi color ans a single int, a sequence of RGB  as ints
         or markup string.
+
+        Colors are kept as FastColor internally and converted
+        to Color when accessed as `source` and `target`.
         """
-        self.source = source
-        self.target = target
+        self._source = FastColor.of(source)
+        self._target = FastColor.of(target)
         self.ansi = ansi
 
+    @property
+    def source(self) -> Color:
+        return self._source.to_color()
+
+    @property
+    def target(self) -> Color:
+        return self._target.to_color()
+
     def __len__(self) -> int:
         """
         >>> cp = ColorPoint(Color('black'), Color('white'), '')
@@ -37,7 +52,7 @@ class ColorPoint(object):
         >>> cp[2]  # luminance
         0.26666666666666666
         """
-        return self.source.hsl[item]
+        return self._source.hsl[item]
 
     def __repr__(self) -> str:
         return 'ColorPoint({!r} => {!r})'.format(self.source, self.target)
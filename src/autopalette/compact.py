@@ -0,0 +1,177 @@
+"""
+Byte-budget output for CI logs and slow links.
+
+Renderers in compact mode, `AutoFormat(compact=True)`, write colors in
+their shortest form (see `autopalette.style.compact_params`).
+`Compactor` re-encodes already rendered text: it replays the escape
+sequences, drops the ones with no visible effect (resets followed by the
+same style, styles replaced before any text) and emits minimal compact
+transitions instead, counting the bytes saved.
+
+`decode` turns output into (character, Style) cells, to check that two
+encodings look the same.
+"""
+from typing import List, Tuple
+
+import re
+
+from autopalette.style import (
+    BOLD,
+    COMPACT,
+    DIM,
+    EMPTY,
+    EXACT_256,
+    INVERSE,
+    ITALIC,
+    UNDERLINE,
+    Style,
+    transition,
+)
+
+SGR = re.compile('\x1b\\[([0-9;]*)m')
+
+Cell = Tuple[str, Style]
+
+_EFFECT_ON = {1: BOLD, 2: DIM, 3: ITALIC, 4: UNDERLINE, 7: INVERSE}
+_EFFECT_OFF = {22: BOLD | DIM, 23: ITALIC, 24: UNDERLINE, 27: INVERSE}
+
+
+def _color(params: List[int], index: int):
+    """
+    Color of an extended 38/48 parameter at `index`,
+    returns (color, parameters consumed).
+    """
+    mode = params[index + 1] if index + 1 < len(params) else None
+    if mode == 5 and index + 2 < len(params):
+        return params[index + 2], 3
+    if mode == 2 and index + 4 < len(params):
+        rgb = tuple(params[index + 2:index + 5])
+        return EXACT_256.get(rgb, rgb), 5
+    return None, len(params) - index
+
+
+def apply_sgr(style: Style, params: str) -> Style:
+    """
+    Style in effect after an SGR sequence with `params`,
+    colors normalized so that equivalent encodings compare equal.
+
+    >>> apply_sgr(EMPTY, '1;31') == apply_sgr(EMPTY, '1;38;5;1')
+    True
+    >>> apply_sgr(Style(BOLD, fg=1), '22;49')
+    Style(effects=32, fg=1, bg=None)
+    """
+    effects, fg, bg = style.effects & ~COMPACT, style.fg, style.bg
+    codes = [int(code) if code else 0 for code in params.split(';')]
+    index = 0
+    while index < len(codes):
+        code = codes[index]
+        used = 1
+        if code == 0:
+            effects, fg, bg = 0, None, None
+        elif code in _EFFECT_ON:
+            effects |= _EFFECT_ON[code]
+        elif code in _EFFECT_OFF:
+            effects &= ~_EFFECT_OFF[code]
+        elif 30 <= code <= 37:
+            fg = code - 30
+        elif 90 <= code <= 97:
+            fg = code - 82
+        elif 40 <= code <= 47:
+            bg = code - 40
+        elif 100 <= code <= 107:
+            bg = code - 92
+        elif code == 39:
+            fg = None
+        elif code == 49:
+            bg = None
+        elif code in (38, 48):
+            color, used = _color(codes, index)
+            if code == 38:
+                fg = color
+            else:
+                bg = color
+        index += used
+    if fg is None and bg is None:
+        return Style(effects)
+    return Style(effects | COMPACT, fg=fg, bg=bg)
+
+
+def decode(text: str) -> List[Cell]:
+    """
+    Visible characters of rendered text with the style each is shown in.
+    """
+    cells = []
+    style = EMPTY
+    position = 0
+    for match in SGR.finditer(text):
+        cells.extend((char, style) for char in text[position:match.start()])
+        style = apply_sgr(style, match.group(1))
+        position = match.end()
+    cells.extend((char, style) for char in text[position:])
+    return cells
+
+
+class Compactor(object):
+    """
+    Re-encode rendered text with the fewest escape bytes.
+    The terminal state carries over between calls,
+    each call ends with the style its input ended with.
+
+    >>> from autopalette import AutoFormat, Ansi256Renderer, AnsiTruecolorRenderer
+    >>> from autopalette.palette import Ansi16Palette
+    >>> line = lambda af: af('ok').ok + ' ' + af('db-1').id + ' ' + af('x').h1
+    >>> for renderer, palette in ((Ansi256Renderer, Ansi16Palette),
+    ...                           (AnsiTruecolorRenderer, None)):
+    ...     full = AutoFormat(term_colors=256, renderer=renderer, palette=palette)
+    ...     compact = AutoFormat(term_colors=256, renderer=renderer,
+    ...                          palette=palette, compact=True)
+    ...     print(len(line(full)), len(line(compact)),
+    ...           decode(line(full)) == decode(line(compact)))
+    57 40 True
+    82 60 True
+    >>> text = '\\x1b[1m\\x1b[38;5;1mA\\x1b[0m\\x1b[1;38;5;1mB\\x1b[0m'
+    >>> compactor = Compactor()
+    >>> encoded = compactor.encode(text)
+    >>> encoded
+    '\\x1b[1;38;5;1mAB\\x1b[0m'
+    >>> decode(encoded) == decode(text), compactor.saved
+    (True, 17)
+    """
+
+    def __init__(self) -> None:
+        self.style = EMPTY
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def encode(self, text: str) -> str:
+        out = []
+        emitted = desired = self.style
+        position = 0
+        for match in SGR.finditer(text):
+            if match.start() > position:
+                out.append(transition(emitted, desired))
+                out.append(text[position:match.start()])
+                emitted = desired
+            desired = apply_sgr(desired, match.group(1))
+            position = match.end()
+        if position < len(text):
+            out.append(transition(emitted, desired))
+            out.append(text[position:])
+            emitted = desired
+        out.append(transition(emitted, desired))
+        self.style = desired
+        encoded = ''.join(out)
+        self.bytes_in += len(text)
+        self.bytes_out += len(encoded)
+        return encoded
+
+    @property
+    def saved(self) -> int:
+        return self.bytes_in - self.bytes_out
+
+    def stats(self) -> dict:
+        return {
+            'bytes_in':  self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'saved':     self.saved,
+        }
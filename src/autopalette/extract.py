@@ -0,0 +1,161 @@
+"""
+Build palettes from images.
+
+`extract_colors` finds representative colors with k-means
+(k-means++ seeding, on a random subsample of large inputs),
+`palette_colors` turns them into an `AutoPalette.colors` definition
+and `extract_palette` into a ready palette class:
+
+    Sunset = extract_palette(pixels, count=6, name='SunsetPalette')
+    af.init(palette=Sunset)
+
+Clustering works on at most `SAMPLE_SIZE` pixels, so extracting
+from a megapixel image takes tens of milliseconds, mostly k-means
+iterations, independent of the image size. Requires NumPy.
+"""
+from typing import Dict, List, Tuple
+
+from autopalette.fastcolor import ANSI256_COLORS
+from autopalette.image import _numpy, to_rgb
+from autopalette.palette import AutoPalette
+
+# Pixels used for clustering, a megapixel image is subsampled to this.
+SAMPLE_SIZE = 20000
+
+# The first 16 codes are themed by terminals, match extended colors only.
+ANSI_EXTENDED = 16
+
+
+def _sq_distances(points, centers):
+    """
+    Squared distances from each point to each center, (points x centers).
+    """
+    numpy = _numpy()
+    distances = ((points * points).sum(axis=1)[:, None]
+                 - 2 * points @ centers.T
+                 + (centers * centers).sum(axis=1)[None, :])
+    return numpy.maximum(distances, 0, out=distances)
+
+
+def kmeans(points, count: int, iterations: int = 20, seed: int = 0):
+    """
+    Cluster centers for an (n x 3) float array.
+    """
+    numpy = _numpy()
+    rng = numpy.random.default_rng(seed)
+    count = min(count, len(points))
+    # k-means++: pick each new center with probability
+    # proportional to its squared distance from the nearest center.
+    centers = numpy.empty((count, points.shape[1]))
+    centers[0] = points[rng.integers(len(points))]
+    nearest = _sq_distances(points, centers[:1])[:, 0]
+    for index in range(1, count):
+        total = nearest.sum()
+        if total == 0:
+            centers = centers[:index]
+            break
+        choice = rng.choice(len(points), p=nearest / total)
+        centers[index] = points[choice]
+        nearest = numpy.minimum(nearest,
+                                _sq_distances(points, centers[index:index + 1])[:, 0])
+    for _ in range(iterations):
+        labels = _sq_distances(points, centers).argmin(axis=1)
+        sums = numpy.stack([numpy.bincount(labels, weights=points[:, axis],
+                                           minlength=len(centers))
+                            for axis in range(points.shape[1])], axis=1)
+        sizes = numpy.bincount(labels, minlength=len(centers))
+        # Empty clusters keep their previous center.
+        filled = sizes > 0
+        updated = centers.copy()
+        updated[filled] = sums[filled] / sizes[filled, None]
+        if numpy.allclose(updated, centers):
+            break
+        centers = updated
+    return centers
+
+
+def _sample(pixels, sample: int, rng):
+    """
+    Up to `sample` pixels as an (n x 3) float array, subsampled
+    before conversion so large images are not converted whole.
+    """
+    numpy = _numpy()
+    pixels = numpy.asarray(pixels)
+    if pixels.ndim == 2 and pixels.shape[-1] in (3, 4):
+        points = pixels  # already a list of colors
+    elif pixels.ndim == 3:
+        points = pixels.reshape(-1, pixels.shape[-1])
+    else:
+        points = pixels.reshape(-1, 1)  # grayscale
+    if not len(points):
+        raise ValueError('Cannot extract colors from an empty image.')
+    if len(points) > sample:
+        points = points[rng.choice(len(points), sample, replace=False)]
+    if points.shape[-1] == 1:
+        points = numpy.repeat(points, 3, axis=-1)
+    return to_rgb(points[None])[0]
+
+
+def extract_colors(pixels, count: int = 8, sample: int = SAMPLE_SIZE,
+                   seed: int = 0) -> List[str]:
+    """
+    Hex colors of the `count` dominant colors of an image
+    or an array of colors, darkest first.
+
+    >>> import numpy
+    >>> pixels = numpy.zeros((10, 10, 3), dtype=numpy.uint8)
+    >>> pixels[:, 5:] = (255, 128, 0)
+    >>> extract_colors(pixels, count=2)
+    ['#000000', '#ff8000']
+    """
+    numpy = _numpy()
+    rng = numpy.random.default_rng(seed)
+    points = _sample(pixels, sample, rng)
+    centers = kmeans(points, count, seed=seed)
+    centers = centers[numpy.argsort(centers @ (.2126, .7152, .0722))]
+    colors = []
+    for red, green, blue in numpy.rint(numpy.clip(centers, 0, 1) * 255).astype(int):
+        color = '#{:02x}{:02x}{:02x}'.format(red, green, blue)
+        if color not in colors:
+            colors.append(color)
+    return colors
+
+
+def nearest_ansi(colors: List[str]) -> List[int]:
+    """
+    Closest extended xterm-256 color codes by RGB distance.
+
+    >>> nearest_ansi(['#000000', '#ff8000', '#777777'])
+    [16, 208, 243]
+    """
+    numpy = _numpy()
+    table = numpy.array([color.rgb for color in ANSI256_COLORS[ANSI_EXTENDED:]])
+    points = numpy.array([[int(color[i:i + 2], 16) / 255 for i in (1, 3, 5)]
+                          for color in colors])
+    return (_sq_distances(points, table).argmin(axis=1)
+            + ANSI_EXTENDED).tolist()
+
+
+def palette_colors(pixels, count: int = 8, **kwargs) -> Dict[str, Tuple[str, int]]:
+    """
+    Palette definition in the format of `AutoPalette.colors`,
+    each extracted color maps to itself and its closest 256-color code.
+
+    >>> import numpy
+    >>> pixels = numpy.zeros((10, 10, 3), dtype=numpy.uint8)
+    >>> pixels[:, 5:] = (255, 128, 0)
+    >>> palette_colors(pixels, count=2)
+    {'#000000': ('#000000', 16), '#ff8000': ('#ff8000', 208)}
+    """
+    colors = extract_colors(pixels, count=count, **kwargs)
+    return {color: (color, ansi)
+            for color, ansi in zip(colors, nearest_ansi(colors))}
+
+
+def extract_palette(pixels, count: int = 8,
+                    name: str = 'ExtractedPalette', **kwargs) -> type:
+    """
+    New `AutoPalette` subclass with colors extracted from an image.
+    """
+    return type(name, (AutoPalette,),
+                {'colors': palette_colors(pixels, count=count, **kwargs)})
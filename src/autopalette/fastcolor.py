@@ -0,0 +1,165 @@
+"""
+Lightweight immutable colors for internal hot paths.
+
+`colour.Color` objects are flexible but heavy: every attribute access
+goes through `__getattr__` and every conversion allocates.
+`FastColor` keeps HSL as a plain tuple and derives RGB forms lazily,
+palettes and renderers use it internally and convert to and from
+`colour.Color` only where colors enter or leave the public API.
+"""
+from typing import Tuple, Union
+
+from colour import Color, FLOAT_ERROR, hsl2rgb, rgb2hsl
+
+from autopalette.colortrans import CLUT, RGB2SHORT_DICT
+from autopalette.utils import rgb_to_RGB255
+
+HSLTuple = Tuple[float, float, float]
+
+
+class FastColor(object):
+    """
+    Immutable color stored as HSL, with RGB, packed 24-bit
+    and hex forms computed once on first use.
+
+    >>> c = FastColor.of(Color('red'))
+    >>> c.packed == 0xff0000, c.hex_l, c.rgb255
+    (True, '#ff0000', (255, 0, 0))
+    >>> c.with_luminance(.25).hex_l
+    '#7f0000'
+    >>> c.to_color()
+    <Color red>
+    """
+    __slots__ = ('hsl', '_rgb', '_packed', '_rgb255')
+
+    def __init__(self, hsl: HSLTuple) -> None:
+        self.hsl = tuple(hsl)
+        self._rgb = None
+        self._packed = None
+        self._rgb255 = None
+
+    @classmethod
+    def of(cls, color: Union['FastColor', Color, str]) -> 'FastColor':
+        if isinstance(color, FastColor):
+            return color
+        if isinstance(color, str):
+            color = Color(color)
+        return cls(color.hsl)
+
+    @classmethod
+    def from_rgb(cls, rgb: Tuple[float, float, float]) -> 'FastColor':
+        color = cls(rgb2hsl(rgb))
+        color._rgb = tuple(rgb)
+        return color
+
+    @classmethod
+    def from_packed(cls, value: int) -> 'FastColor':
+        rgb = ((value >> 16) / 255, ((value >> 8) & 0xff) / 255,
+               (value & 0xff) / 255)
+        color = cls(rgb2hsl(rgb))
+        color._rgb = rgb
+        color._packed = value
+        return color
+
+    @property
+    def rgb(self) -> Tuple[float, float, float]:
+        if self._rgb is None:
+            self._rgb = hsl2rgb(self.hsl)
+        return self._rgb
+
+    @property
+    def packed(self) -> int:
+        """
+        24-bit integer, rounded the same way as `Color.hex_l`.
+        """
+        if self._packed is None:
+            r, g, b = (int(c * 255 + 0.5 - FLOAT_ERROR) for c in self.rgb)
+            self._packed = (r << 16) | (g << 8) | b
+        return self._packed
+
+    @property
+    def hex_l(self) -> str:
+        return '#{:06x}'.format(self.packed)
+
+    @property
+    def rgb255(self) -> Tuple[int, ...]:
+        """
+        0-255 RGB tuple, rounded the same way as `rgb_to_RGB255`.
+        """
+        if self._rgb255 is None:
+            self._rgb255 = rgb_to_RGB255(self.rgb)
+        return self._rgb255
+
+    def get_hue(self) -> float:
+        return self.hsl[0]
+
+    def get_saturation(self) -> float:
+        return self.hsl[1]
+
+    def get_luminance(self) -> float:
+        return self.hsl[2]
+
+    def with_hue(self, value: float) -> 'FastColor':
+        return FastColor((value, self.hsl[1], self.hsl[2]))
+
+    def with_saturation(self, value: float) -> 'FastColor':
+        return FastColor((self.hsl[0], value, self.hsl[2]))
+
+    def with_luminance(self, value: float) -> 'FastColor':
+        return FastColor((self.hsl[0], self.hsl[1], value))
+
+    def mix(self, other: 'FastColor', amount: float) -> 'FastColor':
+        """
+        Linear interpolation in RGB, amount 0 is self and 1 is other.
+
+        >>> FastColor.of('black').mix(FastColor.of('white'), .5).hex_l
+        '#7f7f7f'
+        """
+        return FastColor.from_rgb(tuple(a + (b - a) * amount
+                                        for a, b in zip(self.rgb, other.rgb)))
+
+    def to_color(self) -> Color:
+        return Color(hsl=self.hsl)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FastColor):
+            return NotImplemented
+        return self.hsl == other.hsl
+
+    def __hash__(self) -> int:
+        return hash(self.hsl)
+
+    def __repr__(self) -> str:
+        return '<FastColor {}>'.format(self.hex_l)
+
+
+def _quantize(part: int) -> int:
+    # Same rounding as colortrans.rgb2short, ties go to the bigger step.
+    steps = (0x00, 0x5f, 0x87, 0xaf, 0xd7, 0xff)
+    for smaller, bigger in zip(steps, steps[1:]):
+        if smaller <= part <= bigger:
+            if abs(smaller - part) < abs(bigger - part):
+                return smaller
+            return bigger
+
+
+QUANTIZED = tuple(_quantize(part) for part in range(256))
+
+ANSI_BY_RGB = {int(rgb, 16): int(short)
+               for rgb, short in RGB2SHORT_DICT.items()}
+
+ANSI256_COLORS = tuple(FastColor.from_packed(int(rgb, 16))
+                       for short, rgb in CLUT)
+
+
+def ansi256(color: FastColor) -> int:
+    """
+    Closest xterm-256 color code, equivalent to `colortrans.rgb2short`.
+
+    >>> ansi256(FastColor.of('#123456')), ansi256(FastColor.of('#0dadd6'))
+    (23, 38)
+    """
+    packed = color.packed
+    return ANSI_BY_RGB[(QUANTIZED[packed >> 16] << 16)
+                       | (QUANTIZED[(packed >> 8) & 0xff] << 8)
+                       | QUANTIZED[packed & 0xff]]
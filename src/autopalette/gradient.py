@@ -0,0 +1,159 @@
+"""
+Color numbers by value, e.g. latencies or error rates.
+
+A `Gradient` interpolates a ramp of N colors between stops once,
+matches every step through the active palette and renderer,
+and keeps the resulting escape prefixes. Mapping a value to a color
+is then index arithmetic, for single values, sequences or NumPy arrays.
+NaN values, common in metrics, are left unstyled.
+"""
+from typing import List, Sequence, Union
+
+from autopalette.fastcolor import FastColor
+from autopalette.sgr import RESET
+from autopalette.style import Style
+from autopalette.utils import parse_color
+
+Number = Union[int, float]
+
+# Default stops, names of theme styles.
+HEALTH_STOPS = ('ok', 'warning', 'error')
+
+# Index of values without a color (NaN).
+NAN_INDEX = -1
+
+
+class Gradient(object):
+    """
+    Ramp of `steps` styles between color stops,
+    mapping values from `low` to `high` onto it.
+
+    Stops are theme style names, using their background color if set
+    and foreground otherwise (`error` is white on red, its color is red),
+    or colors as understood by `parse_color`.
+
+    >>> from autopalette import AutoFormat, Ansi256Renderer
+    >>> af = AutoFormat(term_colors=256, renderer=Ansi256Renderer)
+    >>> latency = af.gradient(low=0, high=500, steps=4)
+    >>> latency(20, '{}ms')
+    '\\x1b[38;5;28m20ms\\x1b[0m'
+    >>> latency.indices([0, 200, 499, 900])
+    [0, 1, 3, 3]
+    >>> latency.indices([float('-inf'), float('inf')])
+    [0, 3]
+    >>> latency(float('inf'))
+    '\\x1b[38;5;196minf\\x1b[0m'
+    >>> latency.column([12.5, 480], format_spec='.1f')
+    ['\\x1b[38;5;28m12.5\\x1b[0m', '\\x1b[38;5;196m480.0\\x1b[0m']
+    >>> import numpy
+    >>> latency.indices(numpy.array([0, numpy.nan])), latency(float('nan'))
+    (array([ 0, -1]), 'nan')
+    >>> latency.column(numpy.array([numpy.nan, 20]))
+    ['nan', '\\x1b[38;5;28m20.0\\x1b[0m']
+    >>> latency.column([float('-inf')])
+    ['\\x1b[38;5;28m-inf\\x1b[0m']
+    """
+
+    def __init__(self, af, stops: Sequence[str] = HEALTH_STOPS,
+                 steps: int = 16, low: Number = 0.0,
+                 high: Number = 1.0) -> None:
+        if steps < 1:
+            raise ValueError('A gradient needs at least one step.')
+        if len(stops) < 1:
+            raise ValueError('A gradient needs at least one color stop.')
+        if high == low:
+            raise ValueError('Gradient range is empty: {}..{}'.format(low, high))
+        self.af = af
+        self.steps = steps
+        self.low = low
+        self.high = high
+        self._scale = steps / (high - low)
+        colors = [self._stop_color(stop) for stop in stops]
+        renderer = af.theme.renderer
+        self.colors = [self._ramp_color(colors, step) for step in range(steps)]
+        self.styles = [renderer.style(color)
+                       for color in self.colors]  # type: List[Style]
+        self.prefixes = [style.sgr for style in self.styles]
+        self.suffixes = [RESET if style.sgr else '' for style in self.styles]
+
+    @classmethod
+    def luminance(cls, af, steps: int = 8, base: str = 'white',
+                  low: Number = 0.0, high: Number = 1.0) -> 'Gradient':
+        """
+        Ramp from dark to light shades of `base`,
+        shows how a palette renders its luminance range.
+        """
+        color = FastColor.of(parse_color(base))
+        return cls(af, stops=(color.with_luminance(0).hex_l,
+                              color.with_luminance(.5).hex_l,
+                              color.with_luminance(1).hex_l),
+                   steps=steps, low=low, high=high)
+
+    def _stop_color(self, stop: str) -> FastColor:
+        style = getattr(self.af.theme, stop, None)
+        if style is not None and hasattr(style, 'fg'):
+            return FastColor.of(style.bg or style.fg)
+        return FastColor.of(parse_color(stop))
+
+    def _ramp_color(self, colors: List[FastColor], step: int) -> FastColor:
+        if len(colors) == 1 or self.steps == 1:
+            return colors[0]
+        position = step / (self.steps - 1) * (len(colors) - 1)
+        left = min(int(position), len(colors) - 2)
+        return colors[left].mix(colors[left + 1], position - left)
+
+    def index(self, value: Number) -> int:
+        """
+        Ramp index of a value, `NAN_INDEX` for NaN.
+        Values outside the range, infinities included,
+        get the index of the nearest end.
+        """
+        if value != value:
+            return NAN_INDEX
+        # Clamp before int(), which fails on infinities.
+        scaled = (value - self.low) * self._scale
+        if scaled < 0:
+            return 0
+        if scaled >= self.steps:
+            return self.steps - 1
+        return int(scaled)
+
+    def indices(self, values) -> Union[list, 'numpy.ndarray']:
+        """
+        Ramp indices for a sequence of values,
+        NumPy arrays are mapped without a Python loop.
+        """
+        if hasattr(values, '__array__'):
+            import numpy
+            scaled = (numpy.asarray(values, dtype=float) - self.low) * self._scale
+            scaled = numpy.clip(scaled, 0, self.steps - 1)
+            return numpy.where(numpy.isnan(scaled), NAN_INDEX,
+                               scaled).astype(numpy.intp)
+        index = self.index
+        return [index(value) for value in values]
+
+    def __call__(self, value: Number, template: str = '{}') -> str:
+        """
+        Value formatted with a `str.format` template, colored.
+        """
+        index = self.index(value)
+        if index == NAN_INDEX:
+            return template.format(value)
+        return (self.prefixes[index] + template.format(value)
+                + self.suffixes[index])
+
+    def column(self, values, format_spec: str = '') -> List[str]:
+        """
+        Format a column of values with a `format()` spec,
+        each colored by its own value.
+        """
+        # NAN_INDEX selects the unstyled last entries.
+        prefixes = self.prefixes + ['']
+        suffixes = self.suffixes + ['']
+        if hasattr(values, 'tolist'):
+            indices = self.indices(values).tolist()
+            values = values.tolist()
+        else:
+            indices = self.indices(values)
+        return [prefixes[index] + format(value, format_spec) + suffixes[index]
+                for index, value in zip(indices, values)]
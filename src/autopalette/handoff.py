@@ -0,0 +1,107 @@
+"""
+Hand resolved terminal capabilities over to child processes.
+
+A parent process that has already detected the terminal and read
+configuration can export its choices into an environment variable,
+child processes importing autopalette then skip detection entirely.
+
+The value is a compact, versioned string:
+
+    ap1:<term_colors>:<renderer>:<palette>:<fingerprint>
+
+where fingerprint is a checksum of the environment variables that
+influence detection; values produced under a different environment,
+by another version, or for a stream that is no longer a tty
+are ignored and normal detection takes over.
+"""
+from typing import Optional, Tuple
+
+import os
+import sys
+import zlib
+
+HANDOFF_VARIABLE = 'AUTOPALETTE_HANDOFF'
+HANDOFF_VERSION = 'ap1'
+
+FINGERPRINT_VARIABLES = (
+    'TERM',
+    'COLORTERM',
+    'NO_COLOR',
+    'AUTOPALETTE',
+    'AUTOPALETTE_RENDERER',
+    'AUTOPALETTE_CONFIG',
+)
+
+Handoff = Tuple[int, type, type]
+
+
+def fingerprint(environ=None) -> str:
+    environ = os.environ if environ is None else environ
+    values = '\0'.join(environ.get(name, '\1')
+                       for name in FINGERPRINT_VARIABLES)
+    return '{:08x}'.format(zlib.crc32(values.encode('utf-8', 'replace')))
+
+
+def _renderers() -> dict:
+    from autopalette.render import render_map
+    return {cls.__name__: cls for cls in render_map.values()}
+
+
+def _palettes() -> dict:
+    from autopalette.palette import palette_map
+    return {cls.__name__: cls for cls in palette_map.values()}
+
+
+def encode_handoff(term_colors: int, renderer: type, palette: type,
+                   environ=None) -> str:
+    """
+    >>> from autopalette.render import Ansi256Renderer
+    >>> from autopalette.palette import Ansi256Palette
+    >>> value = encode_handoff(256, Ansi256Renderer, Ansi256Palette, {})
+    >>> value
+    'ap1:256:Ansi256Renderer:Ansi256Palette:50a002ca'
+    >>> decode_handoff(value, {}) == (256, Ansi256Renderer, Ansi256Palette)
+    True
+    >>> decode_handoff(value, {'TERM': 'vt100'}) is None
+    True
+    """
+    if _renderers().get(renderer.__name__) is not renderer:
+        raise ValueError('Cannot hand off custom renderer: {!r}'.format(renderer))
+    if _palettes().get(palette.__name__) is not palette:
+        raise ValueError('Cannot hand off custom palette: {!r}'.format(palette))
+    return ':'.join([HANDOFF_VERSION,
+                     str(int(term_colors)),
+                     renderer.__name__,
+                     palette.__name__,
+                     fingerprint(environ)])
+
+
+def decode_handoff(value: str, environ=None) -> Optional[Handoff]:
+    try:
+        version, term_colors, renderer, palette, checksum = value.split(':')
+        if version != HANDOFF_VERSION or checksum != fingerprint(environ):
+            return None
+        return int(term_colors), _renderers()[renderer], _palettes()[palette]
+    except (ValueError, KeyError):
+        return None
+
+
+def read_handoff(stream=sys.stdout, environ=None) -> Optional[Handoff]:
+    """
+    Read capabilities exported by a parent process,
+    returns None if there are none or they cannot be trusted.
+    """
+    environ = os.environ if environ is None else environ
+    value = environ.get(HANDOFF_VARIABLE)
+    if not value:
+        return None
+    handoff = decode_handoff(value, environ)
+    if handoff is None:
+        return None
+    try:
+        isatty = stream.isatty()
+    except (AttributeError, ValueError):
+        return None
+    if isatty != (handoff[0] != 0):
+        return None
+    return handoff
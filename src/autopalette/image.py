@@ -0,0 +1,267 @@
+"""
+Pixel art and thumbnails drawn with half blocks.
+
+Each terminal cell shows two pixels: an upper half block `▀` in the color
+of the top pixel, over a background in the color of the bottom pixel.
+
+Pixels are quantized through the active renderer and palette, so images
+take the look of `GameBoyGreenPalette`, `Oil6Palette` and friends.
+Palette matches are kept in a lookup table over an RGB cube that is filled
+lazily, one match per cube cell, after which quantizing a frame is
+array indexing. Runs of cells with the same colors share one SGR sequence.
+
+Requires NumPy.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from autopalette.colormatch import ColorPoint
+from autopalette.fastcolor import FastColor
+from autopalette.style import EMPTY, Style, transition
+
+UPPER_HALF = '▀'
+
+DITHER_MODES = (None, 'ordered', 'floyd-steinberg')
+
+BAYER_4 = (
+    (0, 8, 2, 10),
+    (12, 4, 14, 6),
+    (3, 11, 1, 9),
+    (15, 7, 13, 5),
+)
+
+Segment = Tuple[str, Style]
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('Please install python package: numpy')
+    return numpy
+
+
+def to_rgb(pixels):
+    """
+    Float RGB array in 0-1 from integer or float pixels,
+    grayscale and RGBA input is converted.
+    """
+    numpy = _numpy()
+    pixels = numpy.asarray(pixels)
+    if pixels.ndim == 2:
+        pixels = numpy.stack((pixels,) * 3, axis=-1)
+    rgb = pixels[..., :3]
+    if rgb.dtype.kind in 'ui':
+        return rgb / 255
+    return rgb.astype(float)
+
+
+class ImageRenderer(object):
+    """
+    Render RGB arrays (height x width x 3, integers 0-255 or floats 0-1,
+    or anything `numpy.asarray` accepts, like PIL images) as half blocks.
+
+    `dither` is None, 'ordered' (4x4 Bayer) or 'floyd-steinberg',
+    `spread` is the strength of ordered dithering, roughly the
+    distance between neighbouring palette colors.
+
+    >>> import numpy
+    >>> from autopalette import AutoFormat, Ansi256Renderer
+    >>> af = AutoFormat(term_colors=256, renderer=Ansi256Renderer)
+    >>> pixels = numpy.zeros((2, 4, 3), dtype=numpy.uint8)
+    >>> pixels[0, 2:] = 255  # top right half is white
+    >>> af.image()(pixels)
+    '\\x1b[48;5;16m  \\x1b[38;5;231m▀▀\\x1b[0m'
+    >>> compact = AutoFormat(term_colors=256, renderer=Ansi256Renderer,
+    ...                      compact=True)
+    >>> [style.effects for _, style in compact.image().lines(pixels)[0]]
+    [32, 32]
+    """
+
+    def __init__(self, af, dither: Optional[str] = None,
+                 spread: float = 0.25, bits: int = 5) -> None:
+        if dither not in DITHER_MODES:
+            raise ValueError('Unknown dither mode: {!r}, expected one of: {}'
+                             .format(dither, DITHER_MODES))
+        numpy = _numpy()
+        self.renderer = af.theme.renderer
+        self.dither = dither
+        self.spread = spread
+        self.bits = bits
+        self._levels = 1 << bits
+        # Cube cell => index into self.points, -1 until matched.
+        self._lut = numpy.full(1 << (3 * bits), -1, dtype=numpy.int32)
+        self.points = []  # type: List[ColorPoint]
+        self._targets = []  # type: List[Tuple[float, float, float]]
+        self._point_index = {}  # type: Dict[tuple, int]
+        self._cells = {}  # type: Dict[Tuple[int, int], Segment]
+        self._bayer = (numpy.array(BAYER_4, dtype=float) + .5) / 16 - .5
+
+    def _cube(self, rgb):
+        numpy = _numpy()
+        levels = self._levels
+        quantized = numpy.clip((rgb * levels).astype(numpy.intp), 0, levels - 1)
+        return ((quantized[..., 0] << (2 * self.bits))
+                | (quantized[..., 1] << self.bits)
+                | quantized[..., 2])
+
+    def _fill(self, cube_cells) -> None:
+        """
+        Match the centers of cube cells through the renderer's palette.
+        """
+        bits = self.bits
+        mask = self._levels - 1
+        levels = self._levels
+        for cube_cell in cube_cells:
+            cube_cell = int(cube_cell)
+            rgb = (((cube_cell >> (2 * bits)) + .5) / levels,
+                   (((cube_cell >> bits) & mask) + .5) / levels,
+                   ((cube_cell & mask) + .5) / levels)
+            point = self.renderer.point(FastColor.from_rgb(rgb))
+            key = (repr(point.ansi), point._target.packed)
+            index = self._point_index.get(key)
+            if index is None:
+                index = self._point_index[key] = len(self.points)
+                self.points.append(point)
+                self._targets.append(point._target.rgb)
+            self._lut[cube_cell] = index
+
+    def _lookup(self, rgb):
+        numpy = _numpy()
+        cube_cells = self._cube(rgb)
+        indices = self._lut[cube_cells]
+        missing = indices < 0
+        if missing.any():
+            self._fill(numpy.unique(cube_cells[missing]))
+            indices = self._lut[cube_cells]
+        return indices
+
+    def quantize(self, rgb):
+        """
+        Palette indices (into `self.points`) for float RGB pixels.
+        """
+        if self.dither == 'floyd-steinberg':
+            return self._error_diffusion(rgb)
+        if self.dither == 'ordered':
+            numpy = _numpy()
+            height, width = rgb.shape[:2]
+            threshold = numpy.tile(self._bayer, (height // 4 + 1, width // 4 + 1))
+            rgb = rgb + threshold[:height, :width, None] * self.spread
+        return self._lookup(rgb)
+
+    def _error_diffusion(self, rgb):
+        """
+        Floyd-Steinberg dithering against the colors the terminal shows.
+        Error carries along rows, so this walks pixels one by one.
+        """
+        numpy = _numpy()
+        height, width = rgb.shape[:2]
+        work = numpy.clip(rgb, 0, 1).tolist()
+        indices = numpy.empty((height, width), dtype=numpy.int32)
+        lut = self._lut
+        targets = self._targets
+        bits = self.bits
+        top = self._levels - 1
+        for y in range(height):
+            row = work[y]
+            below = work[y + 1] if y + 1 < height else None
+            out = indices[y]
+            for x in range(width):
+                r, g, b = (min(1., max(0., part)) for part in row[x])
+                cube_cell = ((min(int(r * self._levels), top) << (2 * bits))
+                             | (min(int(g * self._levels), top) << bits)
+                             | min(int(b * self._levels), top))
+                index = lut[cube_cell]
+                if index < 0:
+                    self._fill((cube_cell,))
+                    index = lut[cube_cell]
+                out[x] = index
+                tr, tg, tb = targets[index]
+                error = (r - tr, g - tg, b - tb)
+                if x + 1 < width:
+                    pixel = row[x + 1]
+                    for part in range(3):
+                        pixel[part] += error[part] * 7 / 16
+                if below is not None:
+                    for offset, weight in ((-1, 3 / 16), (0, 5 / 16), (1, 1 / 16)):
+                        if 0 <= x + offset < width:
+                            pixel = below[x + offset]
+                            for part in range(3):
+                                pixel[part] += error[part] * weight
+        return indices
+
+    def _cell(self, upper: int, lower: int) -> Segment:
+        """
+        Character and style for a cell, lower is -1 below the last row.
+        """
+        key = (upper, lower)
+        try:
+            return self._cells[key]
+        except KeyError:
+            pass
+        points = self.points
+        if lower < 0:
+            cell = (UPPER_HALF, self.renderer._style(points[upper]))
+        elif upper == lower:
+            cell = (' ', self.renderer._colors(
+                    None, bg=self.renderer._style(points[upper]).fg))
+        else:
+            cell = (UPPER_HALF, self.renderer._style(points[upper],
+                                                      bg=points[lower]))
+        self._cells[key] = cell
+        return cell
+
+    def _pixels(self, pixels, width: Optional[int] = None):
+        numpy = _numpy()
+        rgb = to_rgb(pixels)
+        if width and width < rgb.shape[1]:
+            # Nearest neighbour downscale, keeping the aspect ratio.
+            scale = rgb.shape[1] / width
+            rows = (numpy.arange(max(1, int(rgb.shape[0] / scale)))
+                    * scale).astype(numpy.intp)
+            columns = (numpy.arange(width) * scale).astype(numpy.intp)
+            rgb = rgb[rows][:, columns]
+        return rgb
+
+    def lines(self, pixels, width: Optional[int] = None) -> List[List[Segment]]:
+        """
+        Image as lines of (text, Style) segments,
+        e.g. for `LiveRegion.update()`.
+        """
+        numpy = _numpy()
+        indices = self.quantize(self._pixels(pixels, width=width))
+        height = indices.shape[0]
+        count = len(self.points)
+        lines = []
+        for top in range(0, height, 2):
+            upper = indices[top]
+            if top + 1 < height:
+                lower = indices[top + 1]
+                codes = upper.astype(numpy.int64) * count + lower
+            else:
+                lower = numpy.full_like(upper, -1)
+                codes = upper
+            starts = numpy.flatnonzero(numpy.diff(codes)) + 1
+            bounds = [0] + starts.tolist() + [len(codes)]
+            uppers = upper[bounds[:-1]].tolist()
+            lowers = lower[bounds[:-1]].tolist()
+            line = []
+            for start, end, up, low in zip(bounds, bounds[1:], uppers, lowers):
+                char, style = self._cell(up, low)
+                line.append((char * (end - start), style))
+            lines.append(line)
+        return lines
+
+    def render(self, pixels, width: Optional[int] = None) -> str:
+        rendered = []
+        for line in self.lines(pixels, width=width):
+            parts = []
+            style = EMPTY
+            for text, segment_style in line:
+                parts.append(transition(style, segment_style))
+                parts.append(text)
+                style = segment_style
+            parts.append(transition(style, EMPTY))
+            rendered.append(''.join(parts))
+        return '\n'.join(rendered)
+
+    __call__ = render
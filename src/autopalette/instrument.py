@@ -0,0 +1,331 @@
+"""
+Opt-in counters and timers for hot paths.
+
+    from autopalette import instrument, stats
+    instrument.enable()
+    ...
+    metrics.send(stats(reset=True))
+
+Enabling wraps palette matches, renderer calls, color parsing,
+terminal probes, config reads, render cache lookups and escape sequence
+rendering; disabling puts the original functions back, so there is
+no cost at all while instrumentation is off.
+
+`stats()` returns a flat dict of numbers, e.g.
+`palette.match.Ansi256Palette.calls` and `...seconds`,
+`cache.hits`, `template.hits`, `markup.hits`, `escape_bytes`.
+Nested calls within one category, like a palette's `match` calling
+its base class `match`, are counted once.
+
+`escape_bytes` counts escape sequences in output of styles and
+transitions, render cache hits, and of the paths with precomputed
+escape sequences: templates, markup, gradients, sparklines, bars,
+colorizer lines and segments split by `TeeWriter` and `AsyncWriter`
+(once per value, however many streams it is written to).
+Chunks colorized in worker processes by `Colorizer.colorize_file()`
+are not counted.
+"""
+from collections import defaultdict
+from functools import wraps
+from typing import Callable, Dict, List, Tuple
+
+import re
+import sys
+import threading
+import time
+
+_calls = defaultdict(int)  # type: Dict[str, int]
+_seconds = defaultdict(float)  # type: Dict[str, float]
+_counters = defaultdict(int)  # type: Dict[str, int]
+# Replaced attributes as (owner, name, original).
+_patches = []  # type: List[Tuple[object, str, object]]
+_local = threading.local()
+
+_SGR = re.compile('\x1b\\[[0-9;]*m')
+
+
+def enabled() -> bool:
+    return bool(_patches)
+
+
+def _timed(category: str, label: Callable[[tuple], str], function):
+    """
+    Count and time calls of `function` under the name
+    `label(args)` returns, skipping calls nested in the same category.
+    """
+    perf_counter = time.perf_counter
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        active = _active()
+        if category in active:
+            return function(*args, **kwargs)
+        name = label(args)
+        active.add(category)
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _seconds[name] += perf_counter() - start
+            _calls[name] += 1
+            active.discard(category)
+
+    return wrapper
+
+
+def _patch(owner, name: str, replacement, patches: list = _patches) -> None:
+    patches.append((owner, name, owner.__dict__[name]))
+    setattr(owner, name, replacement)
+
+
+def _restore(patches: list) -> None:
+    while patches:
+        owner, name, original = patches.pop()
+        setattr(owner, name, original)
+
+
+def _patch_function(module, name: str, wrap) -> None:
+    """
+    Replace a module level function, also where it was imported
+    by name into other autopalette modules.
+    """
+    original = getattr(module, name)
+    replacement = wrap(original)
+    for other in list(sys.modules.values()):
+        if getattr(other, '__name__', '').startswith('autopalette') \
+                and other.__dict__.get(name) is original:
+            _patch(other, name, replacement)
+
+
+def _subclasses(cls) -> list:
+    found = [cls]
+    for subclass in cls.__subclasses__():
+        found.extend(_subclasses(subclass))
+    return found
+
+
+def _named(name: str) -> Callable[[tuple], str]:
+    return lambda args: name
+
+
+def _by_class(prefix: str) -> Callable[[tuple], str]:
+    return lambda args: prefix + type(args[0]).__name__
+
+
+def _active() -> set:
+    active = getattr(_local, 'active', None)
+    if active is None:
+        active = _local.active = set()
+    return active
+
+
+def _escape_bytes(function, measure: Callable):
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        result = function(*args, **kwargs)
+        # Skip styles rendered within output counted as a whole.
+        if 'escape' not in _active():
+            _counters['escape_bytes'] += measure(args, result)
+        return result
+
+    return wrapper
+
+
+def _sgr_bytes(text) -> int:
+    if isinstance(text, str):
+        return len(text) - len(_SGR.sub('', text))
+    return sum(_sgr_bytes(item) for item in text)
+
+
+def _escape_output(function, measure: Callable = _sgr_bytes):
+    """
+    Count escape sequences in the output of a precomputed-prefix path.
+    """
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        active = _active()
+        if 'escape' in active:
+            return function(*args, **kwargs)
+        active.add('escape')
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            active.discard('escape')
+        _counters['escape_bytes'] += measure(result)
+        return result
+
+    return wrapper
+
+
+def _uncounted(function):
+    """
+    Exclude escape sequences rendered while precomputing prefixes.
+    """
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        active = _active()
+        if 'escape' in active:
+            return function(*args, **kwargs)
+        active.add('escape')
+        try:
+            return function(*args, **kwargs)
+        finally:
+            active.discard('escape')
+
+    return wrapper
+
+
+def _dict_cache(function, name: str, attribute: str):
+    """
+    Count hits and misses of a method caching in a dict by its argument.
+    """
+    @wraps(function)
+    def wrapper(owner, key, *args, **kwargs):
+        hit = key in getattr(owner, attribute)
+        _counters[name + ('.hits' if hit else '.misses')] += 1
+        return function(owner, key, *args, **kwargs)
+
+    return wrapper
+
+
+def _cache_get(function):
+    @wraps(function)
+    def wrapper(cache, *args, **kwargs):
+        hits, misses, bypassed = cache.hits, cache.misses, cache.bypassed
+        result = function(cache, *args, **kwargs)
+        _counters['cache.hits'] += cache.hits - hits
+        _counters['cache.misses'] += cache.misses - misses
+        _counters['cache.bypassed'] += cache.bypassed - bypassed
+        if cache.hits != hits and 'escape' not in _active():
+            _counters['escape_bytes'] += _sgr_bytes(result)
+        return result
+
+    return wrapper
+
+
+def _split_escape_bytes(result) -> int:
+    colored, plain = result
+    return sum(map(len, colored)) - sum(map(len, plain))
+
+
+def enable() -> None:
+    """
+    Start collecting, counters keep their values from earlier runs.
+    """
+    if _patches:
+        return
+    from autopalette import style, terminfo, utils, writer
+    from autopalette.cache import RenderCache
+    from autopalette.chart import Bar, Sparkline
+    from autopalette.colorize import Colorizer
+    from autopalette.gradient import Gradient
+    from autopalette.markup import Markup
+    from autopalette.palette import BasePalette
+    from autopalette.render import BaseRenderer
+    from autopalette.template import Template, TemplateCache
+
+    for cls in _subclasses(BasePalette):
+        if 'match' in cls.__dict__:
+            _patch(cls, 'match', _timed('palette', _by_class('palette.match.'),
+                                        cls.__dict__['match']))
+    for cls in _subclasses(BaseRenderer):
+        for name in ('style', '_style'):
+            if name in cls.__dict__:
+                _patch(cls, name, _timed('renderer', _by_class('renderer.style.'),
+                                         cls.__dict__[name]))
+    for module, name, label in (
+            (utils, 'parse_color', 'parse_color'),
+            (utils, 'ColorHash', 'colorhash'),
+            (utils, 'terminal_colors', 'terminal.terminal_colors'),
+            (utils, 'curses_colors', 'terminal.curses_colors'),
+            (terminfo, 'terminfo_colors', 'terminal.terminfo_colors'),
+            (utils, 'read_config', 'config.read')):
+        _patch_function(module, name,
+                        lambda function, label=label:
+                        _timed(label, _named(label), function))
+
+    _patch(RenderCache, 'get', _cache_get(RenderCache.__dict__['get']))
+    sgr_length = lambda args, result: len(result) - len(args[1]) \
+        if isinstance(args[1], (str, bytes)) else 0
+    _patch(style.Style, '__call__',
+           _escape_bytes(style.Style.__dict__['__call__'], sgr_length))
+    _patch(style.Style, 'render_bytes',
+           _escape_bytes(style.Style.__dict__['render_bytes'], sgr_length))
+    _patch(style.Style, 'segments',
+           _escape_bytes(style.Style.__dict__['segments'],
+                         lambda args, result: sum(map(len, result[::2]))
+                         if len(result) > 1 else 0))
+    _patch_function(style, 'transition',
+                    lambda function: _escape_bytes(
+                            function, lambda args, result: len(result)))
+    for owner, name in ((Template, 'format'), (Template, '__call__'),
+                        (Markup, 'render'), (Gradient, '__call__'),
+                        (Gradient, 'column'), (Sparkline, '__str__'),
+                        (Bar, '__call__'), (Colorizer, 'line')):
+        _patch(owner, name, _escape_output(owner.__dict__[name]))
+    _patch_function(writer, 'split',
+                    lambda function: _escape_output(function,
+                                                    _split_escape_bytes))
+    for owner, name in ((Template, '_compile'), (Markup, '_tag'),
+                        (Colorizer, '_wrapper')):
+        _patch(owner, name, _uncounted(owner.__dict__[name]))
+    _patch(TemplateCache, 'get',
+           _dict_cache(TemplateCache.__dict__['get'], 'template', '_templates'))
+    _patch(Markup, 'render',
+           _dict_cache(Markup.__dict__['render'], 'markup', '_rendered'))
+
+
+def disable() -> None:
+    """
+    Restore the original functions, collected numbers are kept.
+    """
+    _restore(_patches)
+
+
+def reset() -> None:
+    _calls.clear()
+    _seconds.clear()
+    _counters.clear()
+
+
+_reset = reset
+
+
+def stats(reset: bool = False) -> dict:
+    """
+    Collected numbers as a flat dict, optionally starting over.
+
+    >>> from autopalette import AutoFormat, Ansi256Renderer, instrument
+    >>> af = AutoFormat(term_colors=256, renderer=Ansi256Renderer)
+    >>> instrument.enable()
+    >>> text = af('db-1').id
+    >>> numbers = stats(reset=True)
+    >>> instrument.disable()
+    >>> numbers['parse_color.calls'], numbers['palette.match.Ansi256Palette.calls']
+    (1, 1)
+    >>> numbers['escape_bytes']
+    14
+    >>> instrument.enable()
+    >>> text = af.format('{:ok} {:ok}', 'a', 'b') + af.format('{:ok} {:ok}', 'c', 'd')
+    >>> numbers = stats(reset=True)
+    >>> instrument.disable()
+    >>> numbers['escape_bytes'], numbers['template.hits'], numbers['template.misses']
+    (56, 1, 1)
+    >>> from autopalette import Style, writer
+    >>> cached = AutoFormat(term_colors=256, renderer=Ansi256Renderer, cache=True)
+    >>> instrument.enable()
+    >>> text = cached('ERROR').err + cached('ERROR').err
+    >>> segments = writer.split([('a', Style(fg=1))])
+    >>> numbers = stats(reset=True)
+    >>> instrument.disable()
+    >>> numbers['cache.hits'], numbers['escape_bytes']
+    (1, 61)
+    """
+    numbers = {}  # type: Dict[str, float]
+    for name, calls in _calls.items():
+        numbers[name + '.calls'] = calls
+        numbers[name + '.seconds'] = _seconds[name]
+    numbers.update(_counters)
+    if reset:
+        _reset()
+    return dict(sorted(numbers.items()))
@@ -0,0 +1,182 @@
+"""
+Live-updating block of styled lines, like a tiny curses-free screen.
+
+`LiveRegion` keeps the previous frame as styled cells. Each update
+compares the new frame cell by cell and writes only the changed spans,
+using relative cursor moves and minimal SGR transitions,
+and skips frames arriving faster than `min_interval` seconds.
+
+Lines can be plain strings, `af()`-styled strings, or lists of
+those and (text, Style) segments, e.g. from `Markup.parse()`.
+Plain strings must not contain escape sequences or newlines,
+each character is assumed to take one terminal cell.
+"""
+from typing import Iterable, List, Optional, Tuple
+
+import sys
+import time
+
+from autopalette.sgr import CSI
+from autopalette.style import EMPTY, Style, transition
+
+Cell = Tuple[str, Style]
+
+ERASE_TO_END = CSI + 'K'
+
+# Unchanged cells between two changed spans that are cheaper
+# to rewrite than to skip with a cursor move.
+MERGE_GAP = 4
+
+
+def to_cells(line) -> List[Cell]:
+    """
+    >>> to_cells('ab')
+    [('a', Style(effects=0, fg=None, bg=None)), ('b', Style(effects=0, fg=None, bg=None))]
+    """
+    if hasattr(line, 'plain') and hasattr(line, 'style'):
+        return [(char, line.style) for char in line.plain]
+    if isinstance(line, str):
+        return [(char, EMPTY) for char in line]
+    cells = []
+    for item in line:
+        if isinstance(item, tuple):
+            text, style = item
+            cells.extend((char, style) for char in text)
+        else:
+            cells.extend(to_cells(item))
+    return cells
+
+
+class LiveRegion(object):
+    """
+    >>> import io
+    >>> out = io.StringIO()
+    >>> region = LiveRegion(out, min_interval=0)
+    >>> region.update(['cpu  10%', 'mem  20%'])
+    True
+    >>> region.update(['cpu  12%', 'mem  20%'])
+    True
+    >>> out.getvalue().split('mem  20%\\n')[1]
+    '\\x1b[2A\\x1b[7G2\\x1b[2B\\x1b[1G'
+    """
+
+    def __init__(self, stream=None, min_interval: float = 0.05,
+                 clock=time.monotonic) -> None:
+        self.stream = sys.stdout if stream is None else stream
+        self.min_interval = min_interval
+        self.clock = clock
+        self._frame = []  # type: List[List[Cell]]
+        self._pending = None  # type: Optional[List[List[Cell]]]
+        self._last_draw = None  # type: Optional[float]
+        self.frames_drawn = 0
+        self.frames_skipped = 0
+        self.bytes_written = 0
+
+    def update(self, lines: Iterable, force: bool = False) -> bool:
+        """
+        Set the next frame, returns True if it was drawn
+        and False if it was deferred by rate limiting.
+        """
+        frame = [to_cells(line) for line in lines]
+        now = self.clock()
+        if not force and self._last_draw is not None \
+                and now - self._last_draw < self.min_interval:
+            if self._pending is not None:
+                self.frames_skipped += 1
+            self._pending = frame
+            return False
+        self._draw(frame)
+        self._last_draw = now
+        return True
+
+    def flush(self) -> None:
+        """
+        Draw a frame deferred by rate limiting, if any.
+        """
+        if self._pending is not None:
+            self._draw(self._pending)
+            self._last_draw = self.clock()
+
+    def _draw(self, frame: List[List[Cell]]) -> None:
+        self._pending = None
+        old = self._frame
+        height = len(old)
+        out = []
+        style = EMPTY
+        # Cursor is parked at column 0 of the line below the region.
+        row, col = height, 0
+        for index in range(max(len(frame), height)):
+            new_row = frame[index] if index < len(frame) else []
+            if index >= height:
+                # Lines below the region are simply appended.
+                if row < height:
+                    out.append(CSI + '{}B'.format(height - row))
+                    row = height
+                if col != 0:
+                    out.append(CSI + '1G')
+                    col = 0
+                for char, cell_style in new_row:
+                    out.append(transition(style, cell_style))
+                    out.append(char)
+                    style = cell_style
+                out.append(transition(style, EMPTY))
+                style = EMPTY
+                out.append('\n')
+                continue
+            old_row = old[index]
+            spans = self._changed_spans(old_row, new_row)
+            erase = len(new_row) < len(old_row)
+            if not spans and not erase:
+                continue
+            if row > index:
+                out.append(CSI + '{}A'.format(row - index))
+            elif row < index:
+                out.append(CSI + '{}B'.format(index - row))
+            row = index
+            for start, end in spans:
+                if col != start:
+                    out.append(CSI + '{}G'.format(start + 1))
+                for char, cell_style in new_row[start:end]:
+                    out.append(transition(style, cell_style))
+                    out.append(char)
+                    style = cell_style
+                col = end
+            if erase:
+                if col != len(new_row):
+                    out.append(CSI + '{}G'.format(len(new_row) + 1))
+                    col = len(new_row)
+                out.append(transition(style, EMPTY))
+                style = EMPTY
+                out.append(ERASE_TO_END)
+        out.append(transition(style, EMPTY))
+        if row < height:
+            out.append(CSI + '{}B'.format(height - row))
+        if col != 0:
+            out.append(CSI + '1G')
+        self._frame = frame if len(frame) >= height \
+            else frame + [[] for _ in range(height - len(frame))]
+        data = ''.join(out)
+        if data:
+            self.stream.write(data)
+            self.stream.flush()
+        self.bytes_written += len(data)
+        self.frames_drawn += 1
+
+    @staticmethod
+    def _changed_spans(old: List[Cell], new: List[Cell]) -> List[Tuple[int, int]]:
+        spans = []  # type: List[Tuple[int, int]]
+        length = min(len(old), len(new))
+        index = 0
+        while index < len(new):
+            if index < length and old[index] == new[index]:
+                index += 1
+                continue
+            start = index
+            while index < len(new) and (index >= length
+                                        or old[index] != new[index]):
+                index += 1
+            if spans and start - spans[-1][1] <= MERGE_GAP:
+                spans[-1] = (spans[-1][0], index)
+            else:
+                spans.append((start, index))
+        return spans
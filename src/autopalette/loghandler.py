@@ -0,0 +1,173 @@
+"""
+Colored logging without rendering on the logging thread.
+
+`QueueHandler` puts each record with the name of its style, e.g.
+`err` for errors, on a bounded queue. A background thread formats
+and renders the records through an `AutoFormat` and writes them in
+batches with a `SegmentWriter`:
+
+    handler = QueueHandler(sys.stderr, overflow='drop')
+    logging.getLogger().addHandler(handler)
+
+The style comes from the record's `style` attribute if set, like
+`log.info('ready', extra={'style': 'ok'})`, else from its level.
+Message arguments are merged on the background thread as well,
+so they should not be mutated after logging.
+
+When the queue is full, `overflow` decides what happens:
+`block` waits for room, `drop` discards the record and
+`sample` keeps one in `sample_every` overflowing records,
+waiting for room for those. Discarded records are counted in
+`dropped`. Queued records are written on `flush()` and `close()`,
+which `logging.shutdown()` calls at exit.
+"""
+from typing import Dict, List, Optional
+
+import logging
+import queue
+import sys
+import threading
+
+from autopalette.utils import terminal_colors
+from autopalette.writer import SegmentWriter
+
+LEVEL_STYLES = {
+    logging.DEBUG:    'dark',
+    logging.INFO:     'info',
+    logging.WARNING:  'warn',
+    logging.ERROR:    'err',
+    logging.CRITICAL: 'err',
+}
+
+OVERFLOW_POLICIES = ('block', 'drop', 'sample')
+
+_STOP = object()
+
+
+class QueueHandler(logging.Handler):
+    """
+    >>> import io, logging
+    >>> from autopalette import AutoFormat, Ansi256Renderer
+    >>> af = AutoFormat(term_colors=256, renderer=Ansi256Renderer)
+    >>> out = io.BytesIO()
+    >>> handler = QueueHandler(out, af=af, color=True)
+    >>> log = logging.getLogger('autopalette.doctest')
+    >>> log.addHandler(handler)
+    >>> log.error('disk %s', 'full')
+    >>> log.warning('ready', extra={'style': 'ok'})
+    >>> handler.flush()
+    >>> out.getvalue()
+    b'\\x1b[38;5;231;48;5;196mdisk full\\x1b[0m\\n\\x1b[38;5;28mready\\x1b[0m\\n'
+    >>> log.removeHandler(handler)
+    >>> handler.close()
+    """
+
+    def __init__(self, stream=None, af=None, level: int = logging.NOTSET,
+                 color: bool = None,
+                 styles: Optional[Dict[int, str]] = None,
+                 max_queue: int = 10000,
+                 overflow: str = 'block',
+                 sample_every: int = 10,
+                 batch_size: int = 256) -> None:
+        super().__init__(level)
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError('Unknown overflow policy: {!r}, expected one of: {}'
+                             .format(overflow, ', '.join(OVERFLOW_POLICIES)))
+        if sample_every < 1:
+            raise ValueError('sample_every must be at least 1, got: {}'
+                             .format(sample_every))
+        if stream is None:
+            stream = sys.stderr
+        if af is None:
+            from autopalette import af
+        if color is None:
+            try:
+                color = terminal_colors(stream) != 0
+            except (AttributeError, ValueError, OSError):
+                color = False
+        self.stream = stream
+        self.af = af
+        self.color = color
+        self.styles = LEVEL_STYLES if styles is None else styles
+        self.overflow = overflow
+        self.sample_every = sample_every
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._overflowed = 0
+        self._queue = queue.Queue(max_queue)
+        self._writer = SegmentWriter(stream)
+        self._thread = threading.Thread(target=self._run,
+                                        name='autopalette-log', daemon=True)
+        self._thread.start()
+
+    def style_name(self, record: logging.LogRecord) -> Optional[str]:
+        return getattr(record, 'style', None) or self.styles.get(record.levelno)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        item = (record, self.style_name(record))
+        if not self._thread.is_alive():
+            self._write([item])
+            return
+        if self.overflow == 'block':
+            self._queue.put(item)
+            return
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self._overflowed += 1
+            if self.overflow == 'sample' \
+                    and self._overflowed % self.sample_every == 0:
+                self._queue.put(item)
+            else:
+                self.dropped += 1
+
+    def _run(self) -> None:
+        get = self._queue.get
+        get_nowait = self._queue.get_nowait
+        while True:
+            batch = [get()]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(get_nowait())
+            except queue.Empty:
+                pass
+            stop = _STOP in batch
+            try:
+                self._write([item for item in batch if item is not _STOP])
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, items: List[tuple]) -> None:
+        if not items:
+            return
+        writer = self._writer
+        for record, style in items:
+            try:
+                text = self.format(record)
+                if self.color and style:
+                    writer.write(getattr(self.af(text), style))
+                else:
+                    writer.write(text)
+                writer.write(b'\n')
+            except Exception:
+                self.handleError(record)
+        try:
+            writer.flush()
+        except Exception:
+            self.handleError(items[-1][0])
+
+    def flush(self) -> None:
+        """
+        Wait until queued records are written.
+        """
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        super().close()
@@ -0,0 +1,156 @@
+"""
+Inline markup for styled text.
+
+    af.markup('[h1]Title[/h1] [err]failed[/err] on [id]host-1[/id]')
+
+Tags are the names of `ColoredString` style properties
+(`h1`, `err`, `ok`, `b`, `u`, `id`, ...) and a few aliases.
+Tags nest, inner tags take precedence over colors of outer tags,
+effects accumulate. `[/]` closes the innermost tag, `[[` is a literal `[`
+and anything in brackets that is not a known tag is left as is.
+
+Markup is tokenized in a single pass into a list of (text, Style)
+segments, which are rendered with minimal SGR transitions.
+Both are cached by source string.
+"""
+from typing import Dict, List, Tuple
+
+import re
+
+from autopalette.autoformat import LazyString
+from autopalette.cache import LRUDict
+from autopalette.style import EMPTY, RESET, Style, transition
+from autopalette.template import DYNAMIC_STYLES, STYLE_NAMES, style_affixes
+
+TAG_ALIASES = {
+    'error':     'err',
+    'warning':   'warn',
+    'bold':      'b',
+    'italic':    'i',
+    'underline': 'u',
+    'reverse':   'r',
+    'dim':       'm',
+}
+
+TOKEN = re.compile(r'\[\[|\[(/?)([a-z0-9]*)\]')
+
+Segment = Tuple[str, Style]
+
+
+class Markup(object):
+    """
+    Parse and render markup with the styles of an AutoFormat.
+
+    >>> from autopalette import AutoFormat, Ansi256Renderer
+    >>> af = AutoFormat(term_colors=256, renderer=Ansi256Renderer)
+    >>> af.markup('[ok]done[/ok], [[x] [nope]')
+    '\\x1b[38;5;28mdone\\x1b[0m, [x] [nope]'
+    >>> af.markup('[h1]a [err]b[/err][/h1]')
+    '\\x1b[38;5;16;48;5;226ma \\x1b[38;5;231;48;5;196mb\\x1b[0m'
+    """
+
+    def __init__(self, af, max_entries: int = 1024) -> None:
+        self.af = af
+        self.max_entries = max_entries
+        self._segments = LRUDict(max_entries)  # type: Dict[str, List[Segment]]
+        self._rendered = LRUDict(max_entries)  # type: Dict[str, str]
+        self._tags = {}  # type: Dict[str, Tuple[str, Style]]
+
+    def _tag(self, name: str) -> Tuple[str, Style]:
+        """
+        Text prefix and style for a static tag, e.g. ('- ', light) for `li`.
+        """
+        try:
+            return self._tags[name]
+        except KeyError:
+            pass
+        prefix, _, style = style_affixes(self.af, (name,))
+        tag = self._tags[name] = (prefix, style)
+        return tag
+
+    def _dynamic(self, name: str, text: str) -> Style:
+        return getattr(LazyString(text, self.af.theme,
+                                  term_colors=self.af.term_colors), name).style
+
+    def parse(self, source: str) -> List[Segment]:
+        try:
+            return self._segments[source]
+        except KeyError:
+            pass
+        segments = []  # type: List[Segment]
+        # Open tags as (name, style in effect, index of first segment).
+        stack = []  # type: List[Tuple[str, Style, int]]
+        style = EMPTY
+        position = 0
+        for token in TOKEN.finditer(source):
+            closing, name = token.groups()
+            if token.group() == '[[':
+                text = '['
+            else:
+                name = TAG_ALIASES.get(name, name)
+                open_names = [tag for tag, _, _ in stack]
+                if closing and (name in open_names
+                                or (name == '' and stack)):
+                    text = None
+                elif not closing and name in STYLE_NAMES:
+                    text = None
+                else:
+                    text = token.group()
+            if token.start() > position:
+                segments.append((source[position:token.start()], style))
+            position = token.end()
+            if text is not None:
+                segments.append((text, style))
+                continue
+            if closing:
+                name = name or stack[-1][0]
+                while stack:
+                    tag, _, start = stack.pop()
+                    if tag in DYNAMIC_STYLES:
+                        self._apply_dynamic(segments, tag, start)
+                    if tag == name:
+                        break
+                style = stack[-1][1] if stack else EMPTY
+                continue
+            if name in DYNAMIC_STYLES:
+                stack.append((name, style, len(segments)))
+                continue
+            prefix, tag_style = self._tag(name)
+            style = tag_style | style
+            stack.append((name, style, len(segments)))
+            if prefix:
+                segments.append((prefix, style))
+        if position < len(source):
+            segments.append((source[position:], style))
+        while stack:
+            tag, _, start = stack.pop()
+            if tag in DYNAMIC_STYLES:
+                self._apply_dynamic(segments, tag, start)
+        self._segments[source] = segments
+        return segments
+
+    def _apply_dynamic(self, segments: List[Segment],
+                       name: str, start: int) -> None:
+        """
+        Style segments inside an `id` tag, colored by their text.
+        """
+        text = ''.join(text for text, _ in segments[start:])
+        dynamic = self._dynamic(name, text)
+        segments[start:] = [(text, style | dynamic)
+                            for text, style in segments[start:]]
+
+    def render(self, source: str) -> str:
+        try:
+            return self._rendered[source]
+        except KeyError:
+            pass
+        parts = []
+        style = EMPTY
+        for text, segment_style in self.parse(source):
+            parts.append(transition(style, segment_style))
+            parts.append(text)
+            style = segment_style
+        if style.sgr:
+            parts.append(RESET)
+        rendered = self._rendered[source] = ''.join(parts)
+        return rendered
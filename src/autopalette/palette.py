@@ -4,7 +4,7 @@ from colour import Color
 
 from autopalette.colormatch import ColorPoint, ColorMatch, AnsiCodeType
 from autopalette.utils import parse_color, map_interval
-from autopalette.colortrans import rgb2short, short2rgb
+from autopalette.fastcolor import FastColor, ANSI256_COLORS, ansi256
 
 
 class BasePalette(object):
@@ -14,9 +14,9 @@ class BasePalette(object):
 
 class Ansi256Palette(BasePalette):
     def match(self, color: Color, ansi=False) -> ColorPoint:
-        ansi = int(rgb2short(color.hex_l)[0])
-        target = Color('#' + short2rgb(str(ansi)))
-        return ColorPoint(color, target, ansi=ansi)
+        color = FastColor.of(color)
+        ansi = ansi256(color)
+        return ColorPoint(color, ANSI256_COLORS[ansi], ansi=ansi)
 
 
 class AutoPalette(BasePalette):
@@ -115,7 +115,7 @@ class Gray4Palette(AutoPalette):
     def match(self, color: Color, ansi=False) -> ColorPoint:
         if not ansi:
             return super().match(color)
-        color.set_saturation(0.3)
+        color = FastColor.of(color).with_saturation(0.3)
         return super(Gray4Palette, self).match(color)
 
 
@@ -135,10 +135,11 @@ class Oil6Palette(AutoPalette):
     #   ^^ source       ^^ target ^^ ansi-code
 
     def match(self, color: Color, ansi=False) -> ColorPoint:
+        color = FastColor.of(color)
         lum = map_interval(0, 1, .3, .9, color.get_luminance())
-        color.set_luminance(lum)
+        color = color.with_luminance(lum)
         sat = map_interval(0, 1, .2, .9, color.get_saturation())
-        color.set_saturation(sat)
+        color = color.with_saturation(sat)
         return super().match(color)
 
 
@@ -156,9 +157,9 @@ class GameBoyChocolatePalette(AutoPalette):
     #   ^^ source       ^^ target ^^ ansi-code
 
     def match(self, color: Color, ansi=False) -> ColorPoint:
+        color = FastColor.of(color)
         lum = map_interval(0, 1, .2, .9, color.get_luminance())
-        color.set_luminance(lum)
-        return super().match(color)
+        return super().match(color.with_luminance(lum))
 
 
 class GameBoyGreenPalette(AutoPalette):
@@ -177,9 +178,9 @@ class GameBoyGreenPalette(AutoPalette):
     #   ^^ source       ^^ target ^^ ansi-code
 
     def match(self, color: Color, ansi=False) -> ColorPoint:
+        color = FastColor.of(color)
         lum = map_interval(0, 1, .3, .85, color.get_luminance())
-        color.set_luminance(lum)
-        return super().match(color)
+        return super().match(color.with_luminance(lum))
 
 
 class ColorsCCPalette(AutoPalette):
@@ -229,9 +230,9 @@ class BasicPalette(AutoPalette):
     #   ^^ source   ^^ target  ^^ ansi-code
 
     def match(self, color: Color, ansi=False) -> ColorPoint:
+        color = FastColor.of(color)
         lum = map_interval(0, 1, .2, 1, color.get_luminance())
-        color.set_luminance(lum)
-        return super().match(color)
+        return super().match(color.with_luminance(lum))
 
 
 class DutronPalette(AutoPalette):
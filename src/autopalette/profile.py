@@ -0,0 +1,233 @@
+"""
+Attribute formatting cost to call sites.
+
+Set `AUTOPALETTE_PROFILE` to a file prefix (or `1` for
+`autopalette-profile`) to sample `af(...)` calls and style properties
+like `.id256` or `.h1` while the program runs. At exit the samples are
+written, aggregated by calling file:line and style and sorted by
+estimated time, to `<prefix>.txt` and `<prefix>.json`.
+
+`AUTOPALETTE_PROFILE_RATE` is the fraction of calls sampled,
+0.01 by default. Unsampled calls only decrement a counter,
+each thread counts down on its own.
+Allocations are counted as the net change of the process-wide
+`sys.getallocatedblocks()` during a sampled call, so they include
+blocks allocated or freed by other threads meanwhile.
+"""
+from typing import Dict, List, Optional
+
+import atexit
+import json
+import os
+import random
+import sys
+import threading
+import time
+import warnings
+
+from autopalette.instrument import _patch, _restore
+
+PROFILE_VARIABLE = 'AUTOPALETTE_PROFILE'
+RATE_VARIABLE = 'AUTOPALETTE_PROFILE_RATE'
+DEFAULT_OUTPUT = 'autopalette-profile'
+DEFAULT_RATE = 0.01
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (caller, style) => [samples, seconds, blocks]
+_samples = {}  # type: Dict[tuple, list]
+# Replaced attributes as (owner, name, original).
+_patches = []  # type: List[tuple]
+_every = 1
+# Per thread countdown to the next sample and whether one is running.
+_local = threading.local()
+_output = None  # type: Optional[str]
+
+
+def _caller() -> str:
+    """
+    First frame outside autopalette, so that `af.format()` and
+    markup are attributed to the code calling them.
+    """
+    frame = sys._getframe(2)
+    while frame is not None \
+            and frame.f_code.co_filename.startswith(_PACKAGE_DIR):
+        frame = frame.f_back
+    if frame is None:
+        return '?'
+    return '{}:{}'.format(frame.f_code.co_filename, frame.f_lineno)
+
+
+def _sampled(function, style: str):
+    perf_counter = time.perf_counter
+    allocated = sys.getallocatedblocks
+
+    def wrapper(*args, **kwargs):
+        local = _local
+        countdown = getattr(local, 'countdown', 1) - 1
+        if countdown > 0 or getattr(local, 'active', False):
+            local.countdown = countdown
+            return function(*args, **kwargs)
+        # Randomized gaps avoid locking onto periodic call patterns.
+        local.countdown = random.randint(1, 2 * _every - 1)
+        local.active = True
+        try:
+            caller = _caller()
+            blocks = allocated()
+            start = perf_counter()
+            result = function(*args, **kwargs)
+            seconds = perf_counter() - start
+            blocks = allocated() - blocks
+        finally:
+            local.active = False
+        entry = _samples.get((caller, style))
+        if entry is None:
+            entry = _samples[(caller, style)] = [0, 0.0, 0]
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] += blocks
+        return result
+
+    wrapper.__wrapped__ = function
+    return wrapper
+
+
+def start(rate: float = DEFAULT_RATE, output: Optional[str] = None) -> None:
+    """
+    Start sampling, a fraction `rate` of calls.
+    With an `output` prefix reports are written there at exit.
+    """
+    global _every, _output
+    if not 0 < rate <= 1:
+        raise ValueError('Profile rate must be in (0, 1], got: {}'.format(rate))
+    _every = max(1, round(1 / rate))
+    _local.countdown = 1
+    if output and _output is None:
+        atexit.register(_write_at_exit)
+    _output = output or _output
+    if _patches:
+        return
+    from autopalette.autoformat import AutoFormat, StyleShortcuts
+
+    _patch(AutoFormat, '__call__',
+           _sampled(AutoFormat.__dict__['__call__'], 'af()'), _patches)
+    for name, attr in list(vars(StyleShortcuts).items()):
+        if isinstance(attr, property):
+            _patch(StyleShortcuts, name,
+                   property(_sampled(attr.fget, name)), _patches)
+
+
+def stop() -> None:
+    """
+    Stop sampling and restore the original methods, samples are kept.
+    """
+    _restore(_patches)
+
+
+def environ_rate(environ=None) -> float:
+    """
+    Sampling rate from the environment, an invalid value
+    falls back to the default with a warning rather than failing
+    `import autopalette`.
+
+    >>> import warnings
+    >>> environ_rate({RATE_VARIABLE: '0.5'})
+    0.5
+    >>> with warnings.catch_warnings(record=True) as caught:
+    ...     warnings.simplefilter('always')
+    ...     environ_rate({RATE_VARIABLE: '0'}), environ_rate({RATE_VARIABLE: 'x'})
+    (0.01, 0.01)
+    >>> len(caught)
+    2
+    """
+    environ = os.environ if environ is None else environ
+    value = environ.get(RATE_VARIABLE)
+    if value is None:
+        return DEFAULT_RATE
+    try:
+        rate = float(value)
+    except ValueError:
+        rate = None
+    if rate is None or not 0 < rate <= 1:
+        warnings.warn('Ignoring {}={!r}, expected a number in (0, 1], '
+                      'sampling at {}.'.format(RATE_VARIABLE, value,
+                                               DEFAULT_RATE))
+        return DEFAULT_RATE
+    return rate
+
+
+def start_from_environ(environ=None) -> None:
+    environ = os.environ if environ is None else environ
+    output = environ.get(PROFILE_VARIABLE, '')
+    if not output:
+        return
+    if output.lower() in ('1', 'true', 'yes', 'on'):
+        output = DEFAULT_OUTPUT
+    start(rate=environ_rate(environ), output=output)
+
+
+def reset() -> None:
+    _samples.clear()
+
+
+def report() -> List[dict]:
+    """
+    Samples by call site and style, most expensive first.
+    Estimated calls and time are scaled by the sampling rate.
+
+    >>> from autopalette import AutoFormat, Ansi256Renderer
+    >>> af = AutoFormat(term_colors=256, renderer=Ansi256Renderer)
+    >>> start(rate=1)
+    >>> for host in ('db-1', 'db-2'):
+    ...     text = af(host).id256
+    >>> stop()
+    >>> sorted((row['style'], row['samples']) for row in report())
+    [('af()', 2), ('id256', 2)]
+    >>> report()[0]['caller'].startswith('<doctest')
+    True
+    >>> reset()
+    """
+    rows = []
+    for (caller, style), (samples, seconds, blocks) in _samples.items():
+        rows.append({
+            'caller':          caller,
+            'style':           style,
+            'samples':         samples,
+            'seconds':         seconds,
+            'blocks':          blocks,
+            'mean_us':         seconds / samples * 1e6,
+            'estimated_calls': samples * _every,
+            'estimated_seconds': seconds * _every,
+        })
+    rows.sort(key=lambda row: row['estimated_seconds'], reverse=True)
+    return rows
+
+
+def text_report(rows: Optional[List[dict]] = None) -> str:
+    rows = report() if rows is None else rows
+    lines = ['autopalette profile, 1 in {} calls sampled, blocks are '
+             'process-wide net allocations'.format(_every),
+             '{:>10} {:>10} {:>9} {:>8}  {:<8} {}'.format(
+                     'est. ms', 'est. calls', 'mean us', 'blocks',
+                     'style', 'caller')]
+    for row in rows:
+        lines.append('{:>10.3f} {:>10} {:>9.2f} {:>8}  {:<8} {}'.format(
+                row['estimated_seconds'] * 1e3, row['estimated_calls'],
+                row['mean_us'], row['blocks'], row['style'], row['caller']))
+    return '\n'.join(lines) + '\n'
+
+
+def write(output: str) -> None:
+    rows = report()
+    with open(output + '.txt', 'w') as outfile:
+        outfile.write(text_report(rows))
+    with open(output + '.json', 'w') as outfile:
+        json.dump({'sample_every': _every,
+                   'blocks': 'process-wide net sys.getallocatedblocks()',
+                   'rows': rows}, outfile, indent=2)
+
+
+def _write_at_exit() -> None:
+    stop()
+    if _output:
+        write(_output)
@@ -1,10 +1,11 @@
 from typing import Union, ClassVar
 
-import sty
 from colour import Color
 
 from autopalette.colormatch import ColorPoint, AnsiCodeType
 from autopalette.palette import Ansi256Palette, Ansi16Palette, Ansi8Palette
+from autopalette.sgr import FG, BG, truecolor_fg, truecolor_bg
+from autopalette.style import COMPACT, Style, EMPTY, ansi_code
 from autopalette.utils import rgb_to_RGB255
 
 OptionalColor = Union['Color', None]
@@ -13,15 +14,26 @@ OptionalRenderer = ClassVar['Renderer']
 
 
 class BaseRenderer(object):
+    # Write colors in their shortest form, see `style.compact_params`.
+    compact = False
+
     def __init__(self,
                  palette: OptionalPalette = None,
                  fallback: OptionalPalette = None) -> None:
         self.palette = palette if palette else Ansi256Palette()
         self.fallback = fallback if fallback else Ansi256Palette()
 
-    def render(self, text, fg: Color, bg: OptionalColor = None):
+    def render(self, text, fg: Color, bg: OptionalColor = None, ansi_reset=False):
+        return self.style(fg, bg=bg, ansi_reset=ansi_reset)(text)
+
+    def style(self, fg: Color, bg: OptionalColor = None, ansi_reset=False) -> Style:
         raise NotImplementedError()
 
+    def _colors(self, fg, bg=None) -> Style:
+        if self.compact and (fg is not None or bg is not None):
+            return Style(COMPACT, fg=fg, bg=bg)
+        return Style(fg=fg, bg=bg)
+
     def is_bright(self, color: Color):
         if color.get_saturation() == 0 \
                 and color.get_luminance() == 1:
@@ -35,26 +47,29 @@ class BaseRenderer(object):
 
 
 class Ansi256Renderer(BaseRenderer):
-    def render(self, text, fg: Color, bg: OptionalColor = None, ansi_reset=False):
+    def style(self, fg: Color, bg: OptionalColor = None, ansi_reset=False) -> Style:
         if ansi_reset:
-            return text
-        fg = self.palette.match(fg, ansi=True)
-        if fg.ansi == '' or fg.ansi is None:
-            fg = self.fallback.match(fg.target, ansi=True)
+            return EMPTY
+        fg = self.point(fg)
         if bg:
-            bg = self.palette.match(bg, ansi=True)
-            if bg.ansi == '' or bg.ansi is None:
-                bg = self.fallback.match(bg.target, ansi=True)
-        return self._render(text, fg=fg, bg=bg)
+            bg = self.point(bg)
+        return self._style(fg, bg=bg)
+
+    def point(self, color: Color) -> ColorPoint:
+        """
+        Palette match this renderer draws `color` with.
+        """
+        point = self.palette.match(color, ansi=True)
+        if point.ansi == '' or point.ansi is None:
+            point = self.fallback.match(point._target, ansi=True)
+        return point
+
+    def _style(self, fg: ColorPoint, bg: ColorPoint = None) -> Style:
+        return self._colors(ansi_code(fg.ansi),
+                            ansi_code(bg.ansi) if bg else None)
 
     def _render(self, text, fg: ColorPoint, bg: ColorPoint = None):
-        out = ''
-        out += sty.fg(fg.ansi)
-        if bg:
-            out += sty.bg(bg.ansi)
-        out += text
-        out += sty.rs.all
-        return out
+        return self._style(fg, bg=bg)(text)
 
     def is_bright(self, color: Color):
         ansi = self.palette.match(color).ansi
@@ -65,23 +80,28 @@ class Ansi256Renderer(BaseRenderer):
         return super().is_bright(color)
 
     def bg(self, color: Color) -> str:
-        return sty.bg(self.palette.match(color, ansi=True).ansi)
+        return BG[ansi_code(self.palette.match(color, ansi=True).ansi)]
 
     def fg(self, color: Color) -> str:
-        return sty.fg(self.palette.match(color, ansi=True).ansi)
+        return FG[ansi_code(self.palette.match(color, ansi=True).ansi)]
 
     @property
     def rs(self):
+        import sty
         return sty.rs
 
     @property
     def ef(self):
+        import sty
         return sty.ef
 
 
 class AnsiNoColorRenderer(Ansi256Renderer):
-    def render(self, text, fg: Color, bg: OptionalColor = None, ansi_reset=False):
-        return text
+    def style(self, fg: Color, bg: OptionalColor = None, ansi_reset=False) -> Style:
+        return EMPTY
+
+    def _style(self, fg: ColorPoint, bg: ColorPoint = None) -> Style:
+        return EMPTY
 
 
 class Ansi16Renderer(Ansi256Renderer):
@@ -92,9 +112,9 @@ class Ansi16Renderer(Ansi256Renderer):
         super().__init__(palette=Ansi16Palette,
                          fallback=fallback)
 
-    def render(self, text, fg: Color, bg: OptionalColor = None, ansi_reset=False):
+    def style(self, fg: Color, bg: OptionalColor = None, ansi_reset=False) -> Style:
         # todo: downsample 256 to 16 colors
-        return super().render(text, fg=fg, bg=bg, ansi_reset=False)
+        return super().style(fg, bg=bg, ansi_reset=False)
 
 
 class Ansi8Renderer(Ansi256Renderer):
@@ -105,9 +125,9 @@ class Ansi8Renderer(Ansi256Renderer):
         super().__init__(palette=Ansi8Palette,
                          fallback=fallback)
 
-    def render(self, text, fg: Color, bg: OptionalColor = None, ansi_reset=False):
+    def style(self, fg: Color, bg: OptionalColor = None, ansi_reset=False) -> Style:
         # todo: downsample 256 to 8 colors
-        return super().render(text, fg=fg, bg=bg, ansi_reset=False)
+        return super().style(fg, bg=bg, ansi_reset=False)
 
 
 class AnsiTruecolorRenderer(BaseRenderer):
@@ -115,41 +135,40 @@ class AnsiTruecolorRenderer(BaseRenderer):
         ansi = rgb_to_RGB255(color.rgb)
         return ColorPoint(color, color, ansi=ansi)
 
-    def render(self, text, fg: Color, bg: OptionalColor = None, ansi_reset=False):
+    def style(self, fg: Color, bg: OptionalColor = None, ansi_reset=False) -> Style:
         if ansi_reset:
-            return text
+            return EMPTY
         fg = self.palette.match(fg)
         if bg:
             bg = self.palette.match(bg)
-        return self._render(text, fg=fg, bg=bg)
+        return self._style(fg, bg=bg)
+
+    def point(self, color: Color) -> ColorPoint:
+        return self.palette.match(color)
+
+    def _style(self, fg: ColorPoint, bg: ColorPoint = None) -> Style:
+        return self._colors(fg._target.rgb255,
+                            bg._target.rgb255 if bg else None)
 
     def _render(self, text, fg: ColorPoint, bg: ColorPoint = None):
-        rgb = rgb_to_RGB255(fg.target.rgb)
-        out = ''
-        out += sty.fg(*rgb)
-        if bg:
-            bgrgb = rgb_to_RGB255(bg.target.rgb)
-            out += sty.bg(*bgrgb)
-        out += text
-        out += sty.rs.all
-        return out
+        return self._style(fg, bg=bg)(text)
 
     def bg(self, color: Color) -> str:
         bg = self.palette.match(color)
-        rgb = rgb_to_RGB255(bg.target.rgb)
-        return sty.fg(*rgb)
+        return truecolor_bg(*bg._target.rgb255)
 
     def fg(self, color: Color) -> str:
         fg = self.palette.match(color)
-        rgb = rgb_to_RGB255(fg.target.rgb)
-        return sty.fg(*rgb)
+        return truecolor_fg(*fg._target.rgb255)
 
     @property
     def rs(self):
+        import sty
         return sty.rs
 
     @property
     def ef(self):
+        import sty
         return sty.ef
 
 
@@ -0,0 +1,60 @@
+"""
+Precomputed SGR (Select Graphic Rendition) escape sequences.
+
+Tables are indexed by ANSI 256-color code and available
+both as `str` and pre-encoded `bytes`, so that rendering
+does not need to format escape sequences on every call.
+
+>>> FG[196] == '\\x1b[38;5;196m'
+True
+>>> BG_BYTES[16]
+b'\\x1b[48;5;16m'
+>>> truecolor_fg(255, 128, 0) == '\\x1b[38;2;255;128;0m'
+True
+"""
+from functools import lru_cache
+
+CSI = '\x1b['
+
+FG_PARAMS = tuple('38;5;{}'.format(code) for code in range(256))
+BG_PARAMS = tuple('48;5;{}'.format(code) for code in range(256))
+
+FG = tuple(CSI + params + 'm' for params in FG_PARAMS)
+BG = tuple(CSI + params + 'm' for params in BG_PARAMS)
+FG_BYTES = tuple(seq.encode('ascii') for seq in FG)
+BG_BYTES = tuple(seq.encode('ascii') for seq in BG)
+
+EFFECT_PARAMS = {
+    'bold':    '1',
+    'dim':     '2',
+    'italic':  '3',
+    'underl':  '4',
+    'blink':   '5',
+    'inverse': '7',
+    'hidden':  '8',
+    'strike':  '9',
+}
+EFFECTS = {name: CSI + params + 'm'
+           for name, params in EFFECT_PARAMS.items()}
+EFFECTS_BYTES = {name: seq.encode('ascii')
+                 for name, seq in EFFECTS.items()}
+
+RESET = CSI + '0m'
+RESET_BYTES = RESET.encode('ascii')
+RESET_FG = CSI + '39m'
+RESET_BG = CSI + '49m'
+
+
+@lru_cache(maxsize=1024)
+def truecolor_params(r: int, g: int, b: int, base: int = 38) -> str:
+    return '{};2;{};{};{}'.format(base, r, g, b)
+
+
+@lru_cache(maxsize=1024)
+def truecolor_fg(r: int, g: int, b: int) -> str:
+    return CSI + truecolor_params(r, g, b, 38) + 'm'
+
+
+@lru_cache(maxsize=1024)
+def truecolor_bg(r: int, g: int, b: int) -> str:
+    return CSI + truecolor_params(r, g, b, 48) + 'm'
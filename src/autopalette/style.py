@@ -0,0 +1,253 @@
+from typing import Dict, Optional, Tuple, Union
+
+from autopalette.cache import LRUDict
+from autopalette.colortrans import CLUT
+from autopalette.sgr import (
+    CSI,
+    RESET,
+    RESET_BYTES,
+    BG_PARAMS,
+    EFFECT_PARAMS,
+    FG_PARAMS,
+    truecolor_params,
+)
+
+ColorCode = Union[int, Tuple[int, int, int], None]
+
+BOLD = 1
+DIM = 2
+ITALIC = 4
+UNDERLINE = 8
+INVERSE = 16
+# Encoding flag rather than an effect: colors of the style
+# are written in their shortest form, see `compact_params`.
+COMPACT = 32
+
+EFFECT_CODES = (
+    (BOLD, EFFECT_PARAMS['bold']),
+    (DIM, EFFECT_PARAMS['dim']),
+    (ITALIC, EFFECT_PARAMS['italic']),
+    (UNDERLINE, EFFECT_PARAMS['underl']),
+    (INVERSE, EFFECT_PARAMS['inverse']),
+)
+
+# Upper bound for interned styles, truecolor ids can produce many.
+MAX_INTERNED = 4096
+
+# RGB of extended 256-color codes, the first 16 depend on the terminal.
+EXACT_256 = {}  # type: Dict[Tuple[int, int, int], int]
+for _short, _rgb in CLUT[16:]:
+    EXACT_256.setdefault((int(_rgb[:2], 16), int(_rgb[2:4], 16),
+                          int(_rgb[4:], 16)), int(_short))
+
+
+def color_params(code: ColorCode, base: int) -> str:
+    """
+    SGR parameters for a 256-color index or an RGB tuple,
+    base is 38 for foreground and 48 for background.
+
+    >>> color_params(196, 38)
+    '38;5;196'
+    >>> color_params((255, 128, 0), 48)
+    '48;2;255;128;0'
+    """
+    if isinstance(code, tuple):
+        return truecolor_params(*code, base=base)
+    return (FG_PARAMS if base == 38 else BG_PARAMS)[code]
+
+
+def compact_params(code: ColorCode, base: int, bold: bool = False) -> str:
+    """
+    Shortest SGR parameters for a color: 30-37 and 90-97 (40-47, 100-107)
+    for the first 16 codes, 256-color codes for exactly matching RGB.
+
+    Terminals may show bold text in 30-37 as bright colors,
+    so foreground 0-7 keeps the 256-color form with bold.
+
+    >>> compact_params(1, 38), compact_params(9, 48), compact_params((255, 0, 0), 38)
+    ('31', '101', '38;5;196')
+    >>> compact_params(1, 38, bold=True), compact_params((255, 1, 0), 38)
+    ('38;5;1', '38;2;255;1;0')
+    """
+    if isinstance(code, tuple):
+        code = EXACT_256.get(code, code)
+    if isinstance(code, int):
+        if code < 8 and not (bold and base == 38):
+            return str(base - 8 + code)
+        if 8 <= code < 16:
+            return str(base + 52 + code - 8)
+    return color_params(code, base)
+
+
+def encode_color(effects: int, code: ColorCode, base: int) -> str:
+    if effects & COMPACT:
+        return compact_params(code, base, bold=bool(effects & BOLD))
+    return color_params(code, base)
+
+
+class Style(object):
+    """
+    Immutable, interned combination of effects (a bitmask),
+    foreground and background colors.
+
+    Each distinct style renders to a single precomputed SGR sequence.
+
+    >>> Style(BOLD, fg=16, bg=226).sgr
+    '\\x1b[1;38;5;16;48;5;226m'
+    >>> Style(BOLD) is Style(BOLD)
+    True
+    >>> Style(fg=16, bg=226) | Style(BOLD, fg=1)
+    Style(effects=1, fg=16, bg=226)
+    >>> Style()('plain')
+    'plain'
+    """
+    __slots__ = ('effects', 'fg', 'bg', 'sgr', 'sgr_bytes')
+
+    _interned = LRUDict(MAX_INTERNED)  # type: Dict[tuple, 'Style']
+
+    def __new__(cls, effects: int = 0,
+                fg: ColorCode = None,
+                bg: ColorCode = None) -> 'Style':
+        key = (effects, fg, bg)
+        try:
+            return cls._interned[key]
+        except KeyError:
+            pass
+        self = super().__new__(cls)
+        self.effects = effects
+        self.fg = fg
+        self.bg = bg
+        self.sgr = self._sgr()
+        self.sgr_bytes = self.sgr.encode('ascii')
+        cls._interned[key] = self
+        return self
+
+    def _sgr(self) -> str:
+        params = [code for flag, code in EFFECT_CODES if self.effects & flag]
+        if self.fg is not None:
+            params.append(encode_color(self.effects, self.fg, 38))
+        if self.bg is not None:
+            params.append(encode_color(self.effects, self.bg, 48))
+        if not params:
+            return ''
+        return CSI + ';'.join(params) + 'm'
+
+    def __or__(self, other: 'Style') -> 'Style':
+        """
+        Combine effects of both styles,
+        colors already set on this style take precedence.
+        """
+        return Style(self.effects | other.effects,
+                     fg=self.fg if self.fg is not None else other.fg,
+                     bg=self.bg if self.bg is not None else other.bg)
+
+    def __bool__(self) -> bool:
+        return bool(self.sgr)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Style):
+            return NotImplemented
+        return (self.effects, self.fg, self.bg) == \
+               (other.effects, other.fg, other.bg)
+
+    def __hash__(self) -> int:
+        return hash((self.effects, self.fg, self.bg))
+
+    def __repr__(self) -> str:
+        return 'Style(effects={}, fg={!r}, bg={!r})'.format(
+                self.effects, self.fg, self.bg)
+
+    def __call__(self, text: str) -> str:
+        if not self.sgr:
+            return text
+        return self.sgr + text + RESET
+
+    def segments(self, text: bytes) -> Tuple[bytes, ...]:
+        """
+        Pre-encoded pieces of styled text, ready to be gathered
+        into a single write without joining them first.
+
+        >>> Style(BOLD).segments(b'hi')
+        (b'\\x1b[1m', b'hi', b'\\x1b[0m')
+        """
+        if not self.sgr:
+            return text,
+        return self.sgr_bytes, text, RESET_BYTES
+
+    def render_bytes(self, text: Union[str, bytes],
+                     encoding: str = 'utf-8') -> bytes:
+        if isinstance(text, str):
+            text = text.encode(encoding)
+        if not self.sgr:
+            return text
+        return b''.join((self.sgr_bytes, text, RESET_BYTES))
+
+
+EMPTY = Style()
+
+# SGR parameters switching individual effects off,
+# bold and dim share "normal intensity".
+EFFECT_OFF_CODES = (
+    (BOLD | DIM, '22'),
+    (ITALIC, '23'),
+    (UNDERLINE, '24'),
+    (INVERSE, '27'),
+)
+
+
+def transition(old: Style, new: Style) -> str:
+    """
+    Shortest escape sequence switching from `old` to `new` style,
+    either the changed parameters or a full reset followed by `new`.
+
+    >>> transition(Style(fg=1), Style(BOLD, fg=1))
+    '\\x1b[1m'
+    >>> transition(Style(BOLD, fg=1), Style(fg=2))
+    '\\x1b[22;38;5;2m'
+    >>> transition(Style(BOLD, fg=1), EMPTY)
+    '\\x1b[0m'
+    """
+    if old is new or old == new:
+        return ''
+    if not new.sgr:
+        return RESET
+    if not old.sgr:
+        return new.sgr
+    params = []
+    removed = old.effects & ~new.effects
+    readd = 0
+    for flags, code in EFFECT_OFF_CODES:
+        if removed & flags:
+            params.append(code)
+            # Switching bold off also switches dim off, and vice versa.
+            readd |= new.effects & flags
+    added = (new.effects & ~old.effects) | readd
+    params.extend(code for flag, code in EFFECT_CODES if added & flag)
+    if new.fg != old.fg or (added & BOLD and new.effects & COMPACT
+                            and isinstance(new.fg, int) and new.fg < 8):
+        # Re-sent when bold is switched on, the 30-37 form could brighten.
+        params.append('39' if new.fg is None
+                      else encode_color(new.effects, new.fg, 38))
+    if new.bg != old.bg:
+        params.append('49' if new.bg is None
+                      else encode_color(new.effects, new.bg, 48))
+    if not params:
+        # Styles differing only in encoding look the same.
+        return ''
+    diff = CSI + ';'.join(params) + 'm'
+    full = RESET + new.sgr
+    return diff if len(diff) <= len(full) else full
+
+
+def ansi_code(ansi) -> Optional[ColorCode]:
+    """
+    Normalize an ANSI code from a palette into a Style color code.
+
+    >>> ansi_code('12'), ansi_code(3), ansi_code((1, 2, 3)), ansi_code('')
+    (12, 3, (1, 2, 3), None)
+    """
+    if ansi is None or ansi == '':
+        return None
+    if isinstance(ansi, (tuple, list)):
+        return tuple(int(c) for c in ansi)
+    return int(ansi)
@@ -0,0 +1,193 @@
+"""
+Format strings with per-field styles, compiled once.
+
+    af.format('{user:id} on {host:h1.b}', user='root', host='db-1')
+
+Each field's format spec is a dot separated chain of style names,
+optionally followed by a regular format spec after a second colon:
+`{count:warn:>5}`. A spec that does not start with a style name is
+an ordinary format spec, `{:.2f}` works as in `str.format`.
+Style names win over format types: `{n:b}` is bold, binary
+needs an empty style chain, `{n::b}`.
+
+Static styles (theme styles and effects) are rendered into literal
+prefix and suffix pieces at compile time, rendering then only formats
+the values and joins the pieces. Styles derived from the value itself
+(`id`, `id256`) are applied per value, their color depends on
+`str(value)` and not on the format spec.
+"""
+from functools import reduce
+from string import Formatter
+from typing import Dict, List, Sequence, Tuple, Union
+
+from autopalette.autoformat import LazyString, StyleShortcuts
+from autopalette.cache import LRUDict
+from autopalette.style import Style
+
+STYLE_NAMES = frozenset(name for name, attr in vars(StyleShortcuts).items()
+                        if isinstance(attr, property))
+DYNAMIC_STYLES = frozenset(('id', 'id256'))
+
+# Marks the position of a value while rendering static styles.
+PLACEHOLDER = '\0'
+
+# Upper bound for cached renderings of id styled values per template.
+MAX_DYNAMIC = 1024
+
+_formatter = Formatter()
+
+
+def style_affixes(af, styles: Sequence[str]) -> Tuple[str, str, Style]:
+    """
+    Plain text around a value styled by a chain of static style
+    names, and the style, e.g. ('- ', '', light) for `li`.
+    """
+    lazy = reduce(getattr, styles,
+                  LazyString(PLACEHOLDER, af.theme, term_colors=af.term_colors))
+    prefix, suffix = lazy.plain.split(PLACEHOLDER)
+    return prefix, suffix, lazy.style
+
+
+def render_affixes(af, styles: Sequence[str]) -> Tuple[str, str]:
+    """
+    Rendered text to put before and after a value
+    to style it by a chain of static style names.
+
+    >>> from autopalette import AutoFormat, Ansi256Renderer
+    >>> af = AutoFormat(term_colors=256, renderer=Ansi256Renderer)
+    >>> render_affixes(af, ('ok',)), render_affixes(af, ('li',))
+    (('\\x1b[38;5;28m', '\\x1b[0m'), ('\\x1b[38;5;145m- ', '\\x1b[0m'))
+    """
+    prefix, suffix, style = style_affixes(af, styles)
+    prefix, suffix = style(prefix + PLACEHOLDER + suffix).split(PLACEHOLDER)
+    return prefix, suffix
+
+
+class Field(object):
+    __slots__ = ('name', 'conversion', 'format_spec', 'styles', 'dynamic')
+
+    def __init__(self, name: str, conversion: str, format_spec: str,
+                 styles: Tuple[str, ...]) -> None:
+        self.name = name
+        self.conversion = conversion
+        self.format_spec = format_spec
+        self.styles = styles
+        self.dynamic = bool(DYNAMIC_STYLES.intersection(styles))
+
+
+class Template(object):
+    """
+    Compiled format string, reusable in hot loops.
+
+    >>> from autopalette import AutoFormat, AnsiNoColorRenderer
+    >>> af = AutoFormat(renderer=AnsiNoColorRenderer)
+    >>> template = af.template('{user:id} on {host:h1} ({n:b:>3})')
+    >>> template.format(user='root', host='db-1', n=7)
+    'root on db-1 (  7)'
+    >>> af.format('{} {:li}', 'items', 'one')
+    'items - one'
+    >>> af.format('{:.2f} {:>4}', 1.5, 'x')
+    '1.50    x'
+    >>> af.format('{n:b} {n::b}', n=5)
+    '5 101'
+    >>> from autopalette import Ansi256Renderer
+    >>> af = AutoFormat(term_colors=256, renderer=Ansi256Renderer)
+    >>> af.format('{h:id} {h:id:>6}', h='db-1')
+    '\\x1b[38;5;67mdb-1\\x1b[0m \\x1b[38;5;67m  db-1\\x1b[0m'
+    """
+
+    def __init__(self, template: str, af) -> None:
+        self.template = template
+        self.af = af
+        # Literal pieces at even positions, fields at odd positions.
+        self.pieces = []  # type: List[Union[str, Field]]
+        # Values styled by id/id256 repeat a lot, e.g. user and host names.
+        self._dynamic = LRUDict(MAX_DYNAMIC)  # type: Dict[tuple, str]
+        self._compile()
+
+    def _lazy(self, text: str, styles: Tuple[str, ...],
+              key: str = '') -> LazyString:
+        return reduce(getattr, styles,
+                      LazyString(text, self.af.theme, key=key,
+                                 term_colors=self.af.term_colors))
+
+    def _compile(self) -> None:
+        literal = []
+        auto_index = 0
+        for text, name, spec, conversion in _formatter.parse(self.template):
+            literal.append(text)
+            if name is None:
+                continue
+            if name == '':
+                name = str(auto_index)
+                auto_index += 1
+            styles, _, format_spec = (spec or '').partition(':')
+            if styles and styles.split('.')[0] not in STYLE_NAMES:
+                # An ordinary format spec, e.g. '.2f'.
+                styles, format_spec = '', spec
+            styles = tuple(style for style in styles.split('.') if style)
+            unknown = set(styles) - STYLE_NAMES
+            if unknown:
+                raise ValueError('Unknown style in template {!r}: {}'.format(
+                        self.template, ', '.join(sorted(unknown))))
+            field = Field(name, conversion, format_spec, styles)
+            if field.dynamic:
+                self.pieces.append(''.join(literal))
+                literal = []
+            else:
+                prefix, suffix = render_affixes(self.af, styles)
+                self.pieces.append(''.join(literal) + prefix)
+                literal = [suffix]
+            self.pieces.append(field)
+        self.pieces.append(''.join(literal))
+
+    def format(self, *args, **kwargs) -> str:
+        parts = self.pieces[:]
+        fix = self.af.fix
+        for index in range(1, len(parts), 2):
+            field = parts[index]
+            value, _ = _formatter.get_field(field.name, args, kwargs)
+            if field.conversion:
+                value = _formatter.convert_field(value, field.conversion)
+            text = fix(format(value, field.format_spec))
+            if field.dynamic:
+                text = self._render_dynamic(text, field.styles, str(value))
+            parts[index] = text
+        return ''.join(parts)
+
+    __call__ = format
+
+    def _render_dynamic(self, text: str, styles: Tuple[str, ...],
+                        value: str) -> str:
+        """
+        Formatted text in the colors of the unformatted value.
+        """
+        key = (text, styles, value)
+        try:
+            return self._dynamic[key]
+        except KeyError:
+            pass
+        rendered = self._dynamic[key] = str(self._lazy(text, styles, value))
+        return rendered
+
+    def __repr__(self) -> str:
+        return 'Template({!r})'.format(self.template)
+
+
+class TemplateCache(object):
+    """
+    Compiled templates keyed by template string.
+    """
+
+    def __init__(self, af, max_entries: int = 512) -> None:
+        self.af = af
+        self.max_entries = max_entries
+        self._templates = LRUDict(max_entries)  # type: Dict[str, Template]
+
+    def get(self, template: str) -> Template:
+        try:
+            return self._templates[template]
+        except KeyError:
+            pass
+        compiled = self._templates[template] = Template(template, self.af)
+        return compiled
@@ -0,0 +1,210 @@
+"""
+Minimal reader for compiled terminfo entries.
+
+Reads color related capabilities straight from the terminfo database,
+without initializing curses in the host process or requiring a tty.
+Supports the legacy (16-bit numbers) and extended (32-bit numbers)
+formats, as well as the extended capability section used by
+ncurses for user-defined capabilities like `RGB` and `Tc`.
+
+See term(5) for the file format.
+"""
+from typing import Dict, List, Optional, Union
+
+import os
+import struct
+
+MAGIC_LEGACY = 0o432
+MAGIC_EXTENDED = 0o1036
+
+# Positions of the predefined numeric capabilities we care about.
+NUMBER_CAPABILITIES = {
+    'cols':   0,
+    'lines':  2,
+    'colors': 13,
+    'pairs':  14,
+}
+
+TERMINFO_DIRS = (
+    '/etc/terminfo',
+    '/lib/terminfo',
+    '/usr/share/terminfo',
+    '/usr/lib/terminfo',
+    '/usr/share/lib/terminfo',
+    '/usr/local/share/terminfo',
+)
+
+CapabilityValue = Union[bool, int, str]
+
+_cache = {}  # type: Dict[str, Optional[Dict[str, CapabilityValue]]]
+
+
+class TerminfoError(ValueError):
+    pass
+
+
+def terminfo_dirs() -> List[str]:
+    """
+    Directories searched for compiled entries, in ncurses order.
+    """
+    dirs = []
+    if os.environ.get('TERMINFO'):
+        dirs.append(os.environ['TERMINFO'])
+    dirs.append(os.path.expanduser('~/.terminfo'))
+    for path in os.environ.get('TERMINFO_DIRS', '').split(':'):
+        if path:
+            dirs.append(path)
+        else:
+            dirs.extend(TERMINFO_DIRS)
+    dirs.extend(TERMINFO_DIRS)
+    return dirs
+
+
+def find_entry(term: str) -> Optional[str]:
+    if not term or '/' in term or term.startswith('.'):
+        return None
+    for directory in terminfo_dirs():
+        # Entries live under their first letter, or its hex code on macOS.
+        for subdir in (term[0], '{:02x}'.format(ord(term[0]))):
+            path = os.path.join(directory, subdir, term)
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+def _strings(offsets: tuple, table: bytes) -> List[Optional[str]]:
+    values = []
+    for offset in offsets:
+        if offset < 0 or offset >= len(table):
+            values.append(None)
+            continue
+        end = table.index(b'\0', offset)
+        values.append(table[offset:end].decode('latin-1'))
+    return values
+
+
+def parse_terminfo(data: bytes) -> Dict[str, CapabilityValue]:
+    """
+    Parse a compiled terminfo entry into a dict of color capabilities.
+
+    Only numeric capabilities listed in NUMBER_CAPABILITIES are kept
+    from the predefined section; every extended capability is kept.
+
+    >>> header = struct.pack('<6h', MAGIC_LEGACY, 6, 0, 14, 0, 0)
+    >>> numbers = struct.pack('<14h', *([-1] * 13 + [256]))
+    >>> parse_terminfo(header + b'test\\x00\\x00' + numbers)['colors']
+    256
+    """
+    try:
+        magic, names_size, bool_count, num_count, str_count, table_size = \
+            struct.unpack_from('<6h', data, 0)
+    except struct.error:
+        raise TerminfoError('Truncated terminfo header')
+    if magic == MAGIC_LEGACY:
+        num_format, num_size = 'h', 2
+    elif magic == MAGIC_EXTENDED:
+        num_format, num_size = 'i', 4
+    else:
+        raise TerminfoError('Unknown terminfo magic: {:o}'.format(magic))
+
+    caps = {}  # type: Dict[str, CapabilityValue]
+    try:
+        pos = 12 + names_size
+        caps['names'] = data[12:pos].rstrip(b'\0').decode('latin-1')
+        pos += bool_count
+        pos += pos % 2
+        numbers = struct.unpack_from('<{}{}'.format(num_count, num_format),
+                                     data, pos)
+        pos += num_count * num_size
+        for name, index in NUMBER_CAPABILITIES.items():
+            if index < num_count and numbers[index] >= 0:
+                caps[name] = numbers[index]
+        pos += str_count * 2 + table_size
+        pos += pos % 2
+        if len(data) - pos >= 10:
+            caps.update(_parse_extended(data, pos, num_format, num_size))
+    except (struct.error, ValueError) as e:
+        raise TerminfoError('Malformed terminfo entry: {}'.format(e))
+    return caps
+
+
+def _parse_extended(data: bytes, pos: int,
+                    num_format: str, num_size: int) -> Dict[str, CapabilityValue]:
+    bool_count, num_count, str_count, _, table_size = \
+        struct.unpack_from('<5h', data, pos)
+    pos += 10
+    bools = data[pos:pos + bool_count]
+    pos += bool_count
+    pos += pos % 2
+    numbers = struct.unpack_from('<{}{}'.format(num_count, num_format),
+                                 data, pos)
+    pos += num_count * num_size
+    name_count = bool_count + num_count + str_count
+    offsets = struct.unpack_from('<{}h'.format(str_count + name_count),
+                                 data, pos)
+    pos += (str_count + name_count) * 2
+    table = data[pos:pos + table_size]
+
+    values = _strings(offsets[:str_count], table)
+    # Capability names follow the last string value in the table.
+    names_start = 0
+    for offset, value in zip(offsets[:str_count], values):
+        if value is not None:
+            names_start = max(names_start, offset + len(value) + 1)
+    names = _strings(tuple(names_start + offset
+                           for offset in offsets[str_count:]), table)
+
+    caps = {}  # type: Dict[str, CapabilityValue]
+    bool_names = names[:bool_count]
+    num_names = names[bool_count:bool_count + num_count]
+    str_names = names[bool_count + num_count:]
+    for name, value in zip(bool_names, bools):
+        if name and value == 1:
+            caps[name] = True
+    for name, value in zip(num_names, numbers):
+        if name and value >= 0:
+            caps[name] = value
+    for name, value in zip(str_names, values):
+        if name and value is not None:
+            caps[name] = value
+    return caps
+
+
+def read_terminfo(term: str = None) -> Optional[Dict[str, CapabilityValue]]:
+    """
+    Read and cache capabilities for a terminal,
+    defaults to the value of $TERM.
+
+    Returns None if no compiled entry is found or it cannot be parsed.
+    """
+    if term is None:
+        term = os.environ.get('TERM', '')
+    try:
+        return _cache[term]
+    except KeyError:
+        pass
+    caps = None
+    path = find_entry(term)
+    if path:
+        try:
+            with open(path, 'rb') as infile:
+                caps = parse_terminfo(infile.read())
+        except (OSError, TerminfoError):
+            caps = None
+    _cache[term] = caps
+    return caps
+
+
+def terminfo_colors(term: str = None) -> Optional[int]:
+    """
+    Number of colors supported by a terminal as per terminfo,
+    -1 for terminals advertising direct (24-bit) color
+    and None if the terminal is not in the database.
+    """
+    caps = read_terminfo(term)
+    if caps is None:
+        return None
+    if caps.get('RGB') or caps.get('Tc') \
+            or ('setrgbf' in caps and 'setrgbb' in caps):
+        return -1
+    return max(0, caps.get('colors', 0))
@@ -1,9 +1,10 @@
-import sty
 from colour import Color
 
 from autopalette.colormatch import AnsiCodeType
+from autopalette.fastcolor import FastColor
 from autopalette.palette import Ansi256Palette
 from autopalette.render import OptionalPalette, OptionalRenderer, Ansi256Renderer
+from autopalette.style import Style
 
 
 class ThemeColor(object):
@@ -32,6 +33,20 @@ class ThemeColor(object):
             getattr(color, method)(*args)
         return self
 
+    def edit(self, color: FastColor) -> FastColor:
+        """
+        Same as apply, for immutable colors: returns the edited color.
+
+        >>> ThemeColor('white').set_luminance(.5).edit(FastColor.of('white'))
+        <FastColor #7f7f7f>
+        """
+        for method, args in self._edits:
+            if method == 'reset':
+                self.ansi_reset = True
+                continue
+            color = getattr(color, method.replace('set_', 'with_', 1))(*args)
+        return color
+
     def reset(self):
         self._edits.append(('reset', [True]))
         return self
@@ -68,12 +83,27 @@ class ThemeStyle(object):
         self.bg = bg
         self._renderer = renderer
         self._ansi_reset = ansi_reset
+        self._style = None
 
     def __repr__(self):
         return 'Style(fg={}, bg={})'.format(self.fg, self.bg)
 
     def __call__(self, text):
-        return self._renderer.render(text, fg=self.fg, bg=self.bg, ansi_reset=self._ansi_reset)
+        return self.style(text)
+
+    def render_bytes(self, text, encoding='utf-8') -> bytes:
+        return self.style.render_bytes(text, encoding=encoding)
+
+    @property
+    def style(self) -> Style:
+        """
+        Colors of a theme do not change, match them
+        against the palette once and reuse the result.
+        """
+        if self._style is None:
+            self._style = self._renderer.style(self.fg, bg=self.bg,
+                                               ansi_reset=self._ansi_reset)
+        return self._style
 
     @property
     def renderer(self):
@@ -94,15 +124,13 @@ class Theme(object):
                     continue
                 else:
                     raise ValueError('Background set without foreground: {}'.format(name))
-            match = self.palette.match(Color(attr._color))
-            fg = Color(match.target.hex_l)
-            attr.apply(fg)
+            match = self.palette.match(FastColor.of(attr._color))
+            fg = attr.edit(match._target)
             bg = None
             if hasattr(self, '_' + name):
                 bgattr = getattr(self, '_' + name)
-                bgmatch = self.palette.match(Color(bgattr._color))
-                bg = Color(bgmatch.target.hex_l)
-                bgattr.apply(bg)
+                bgmatch = self.palette.match(FastColor.of(bgattr._color))
+                bg = bgattr.edit(bgmatch._target)
             setattr(self, name,
                     ThemeStyle(fg, bg=bg,
                                renderer=self.renderer,
@@ -122,19 +122,31 @@ def terminal_colors(stream=sys.stdout) -> int:
         elif os.environ.get('COLORTERM', '').lower() in ['truecolor', '24bit']:
             colors = -1
         else:
-            # curses is used to autodetect terminal colors on *nix.
-            try:
-                from curses import setupterm, tigetnum
+            # terminfo database is read directly to detect colors on *nix.
+            from autopalette.terminfo import terminfo_colors
 
-                setupterm()
-                colors = max(0, tigetnum('colors'))
-            except ImportError:
-                pass
-            except:
-                pass
+            colors = terminfo_colors()
+            if colors is None:
+                colors = curses_colors(stream)
     return colors
 
 
+def curses_colors(stream=sys.stdout) -> int:
+    """
+    Fallback for terminals that cannot be found in terminfo database
+    directories known to autopalette, asks curses instead.
+    """
+    try:
+        import curses
+    except ImportError:
+        return 0
+    try:
+        curses.setupterm(fd=stream.fileno())
+        return max(0, curses.tigetnum('colors'))
+    except (curses.error, AttributeError, OSError, ValueError):
+        return 0
+
+
 def read_config(filename: os.PathLike = '~/.autopalette'):
     filename = os.environ.get('AUTOPALETTE_CONFIG', filename)
     filename = os.path.expanduser(filename)
@@ -0,0 +1,125 @@
+"""
+Visible width of text in terminal cells.
+
+Wide (East Asian wide and fullwidth) characters and emoji take two cells,
+combining marks, zero width joiners and other format characters none.
+Text is measured in grapheme-like clusters: a base character with its
+combining marks, variation selectors and zero width joined characters,
+so that ZWJ emoji sequences count as a single wide character.
+
+Characters are classified by binary search in precomputed range tables
+(`autopalette.widthtable`), printable ASCII text skips classification
+and widths of recently measured strings are cached.
+"""
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, Iterator, Tuple
+
+from autopalette.cache import LRUDict
+from autopalette.sgr import CSI
+from autopalette.widthtable import WIDE, ZERO_WIDTH
+
+ZWJ = '\u200d'
+VS16 = '\ufe0f'  # Emoji presentation selector, makes the base wide.
+
+# Upper bound for cached string widths.
+MAX_CACHED = 4096
+
+SAVE_CURSOR = CSI + 's'
+RESTORE_CURSOR = CSI + 'u'
+
+_ZERO_STARTS = tuple(first for first, _ in ZERO_WIDTH)
+_ZERO_ENDS = tuple(last for _, last in ZERO_WIDTH)
+_WIDE_STARTS = tuple(first for first, _ in WIDE)
+_WIDE_ENDS = tuple(last for _, last in WIDE)
+
+_widths = LRUDict(MAX_CACHED)  # type: Dict[str, int]
+
+try:
+    _isascii = str.isascii
+except AttributeError:  # Python 3.6
+    def _isascii(text: str) -> bool:
+        return len(text) == len(text.encode('utf-8'))
+
+
+def _in_table(code: int, starts: Tuple[int, ...], ends: Tuple[int, ...]) -> bool:
+    index = bisect_right(starts, code) - 1
+    return index >= 0 and code <= ends[index]
+
+
+def char_width(char: str) -> int:
+    """
+    >>> char_width('a'), char_width('界'), char_width('\\u0301'), char_width('🌍')
+    (1, 2, 0, 2)
+    """
+    if ' ' <= char < '\x7f':
+        return 1
+    code = ord(char)
+    if _in_table(code, _ZERO_STARTS, _ZERO_ENDS):
+        return 0
+    if _in_table(code, _WIDE_STARTS, _WIDE_ENDS):
+        return 2
+    return 1
+
+
+def clusters(text: str) -> Iterator[Tuple[str, int]]:
+    """
+    Clusters of text that render as one unit, with their width.
+
+    >>> [(len(cluster), width) for cluster, width in clusters('e\\u0301x')]
+    [(2, 1), (1, 1)]
+    >>> [width for _, width in clusters('👩\\u200d💻!')]
+    [2, 1]
+    """
+    cluster = ''
+    width = 0
+    joined = False
+    for char in text:
+        char_cells = char_width(char)
+        if cluster and (joined or char_cells == 0):
+            if char == VS16:
+                width = 2
+            cluster += char
+            joined = char == ZWJ
+            continue
+        if cluster:
+            yield cluster, width
+        cluster = char
+        width = char_cells
+        joined = char == ZWJ
+    if cluster:
+        yield cluster, width
+
+
+def text_width(text: str) -> int:
+    """
+    >>> text_width('hello'), text_width('日本'), text_width('🇮🇳 ok')
+    (5, 4, 5)
+    """
+    if _isascii(text) and text.isprintable():
+        return len(text)
+    try:
+        return _widths[text]
+    except KeyError:
+        pass
+    width = _widths[text] = sum(width for _, width in clusters(text))
+    return width
+
+
+@lru_cache(maxsize=256)
+def reserve_cells(text: str) -> str:
+    """
+    Print `text` over blank cells reserved for its computed width and
+    continue after them, so that the rest of a line (e.g. a shell prompt)
+    stays aligned even where a terminal draws emoji narrower or wider.
+
+    >>> reserve_cells('ok')
+    'ok'
+    >>> reserve_cells('🇮🇳')
+    '  \\x1b[s\\x1b[2D🇮🇳\\x1b[u'
+    """
+    if _isascii(text):
+        return text
+    width = text_width(text)
+    return '{}{}{}{}D{}{}'.format(' ' * width, SAVE_CURSOR, CSI, width,
+                                  text, RESTORE_CURSOR)
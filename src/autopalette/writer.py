@@ -0,0 +1,246 @@
+"""
+Bytes-native output for styled text.
+
+`SegmentWriter` collects pre-encoded escape sequences and text
+as separate segments and hands them to the operating system
+with a single `os.writev()` call where available, or a single
+write to the stream's binary buffer otherwise,
+so that styled text is never concatenated into intermediate strings.
+
+`TeeWriter` sends the same output to several streams, colored to
+terminals and plain to files, from segments rendered once.
+"""
+from typing import List, Sequence, Tuple, Union
+
+import io
+import os
+import sys
+
+try:
+    IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    IOV_MAX = 1024
+
+from autopalette.style import EMPTY, RESET_BYTES, transition
+
+Segment = Union[bytes, bytearray, memoryview]
+
+
+class PrintMixin(object):
+    """
+    `print()` for writers with `write()` and `encoding`.
+    """
+
+    def print(self, *values, sep: str = ' ', end: str = '\n') -> None:
+        sep = sep.encode(self.encoding)
+        for index, value in enumerate(values):
+            if index:
+                self.write(sep)
+            self.write(value)
+        self.write(end.encode(self.encoding))
+
+
+class SegmentWriter(PrintMixin):
+    """
+    Gather segments of styled output and write them in batches.
+
+    >>> import io
+    >>> out = io.BytesIO()
+    >>> writer = SegmentWriter(out)
+    >>> writer.write('plain ')
+    >>> writer.write(b'bytes')
+    >>> writer.print('', 3)
+    >>> writer.flush()
+    >>> out.getvalue()
+    b'plain bytes 3\\n'
+    """
+
+    def __init__(self, stream=None, encoding: str = 'utf-8',
+                 buffer_size: int = 64 * 1024) -> None:
+        self.stream = sys.stdout if stream is None else stream
+        self.encoding = encoding
+        self.buffer_size = buffer_size
+        self._segments = []  # type: List[Segment]
+        self._size = 0
+        self._fd = None
+        if hasattr(os, 'writev'):
+            try:
+                self._fd = self.stream.fileno()
+            except (AttributeError, ValueError, OSError):
+                self._fd = None
+
+    def __enter__(self) -> 'SegmentWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
+
+    def write(self, value) -> None:
+        """
+        Queue a ColoredString, any object with `segments()`,
+        `str` or bytes for writing, anything else as `str(value)`.
+        """
+        if hasattr(value, 'segments'):
+            segments = value.segments(self.encoding)
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            segments = value,
+        else:
+            segments = str(value).encode(self.encoding),
+        self.extend(segments)
+
+    def extend(self, segments: Sequence[Segment]) -> None:
+        """
+        Queue already encoded segments.
+        """
+        for segment in segments:
+            if not isinstance(segment, (bytes, bytearray, memoryview)):
+                raise TypeError('Expected bytes-like segments, got: {!r}'
+                                .format(segment))
+        self._segments.extend(segments)
+        self._size += sum(len(segment) for segment in segments)
+        if self._size >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        segments = self._segments
+        if not segments:
+            return
+        self._segments = []
+        self._size = 0
+        # Text written through the stream itself must come out first.
+        if hasattr(self.stream, 'flush'):
+            self.stream.flush()
+        if self._fd is not None:
+            self._writev(segments)
+        elif hasattr(self.stream, 'buffer'):
+            self.stream.buffer.write(b''.join(segments))
+            self.stream.buffer.flush()
+        elif isinstance(self.stream, io.TextIOBase):
+            self.stream.write(b''.join(segments).decode(self.encoding))
+        else:
+            self.stream.write(b''.join(segments))
+
+    def _writev(self, segments: List[Segment]) -> None:
+        while segments:
+            batch = segments[:IOV_MAX]
+            written = os.writev(self._fd, batch)
+            # Drop fully written segments, keep a view of a partial one.
+            for index, segment in enumerate(batch):
+                if written < len(segment):
+                    segments = [memoryview(segment)[written:]] \
+                               + segments[index + 1:]
+                    break
+                written -= len(segment)
+            else:
+                segments = segments[len(batch):]
+
+
+def split(value, encoding: str = 'utf-8') -> Tuple[Sequence[Segment], Sequence[Segment]]:
+    """
+    Colored and plain segments for a value, sharing text segments.
+    Lists and tuples are (text, Style) segments, values other than
+    styled strings, `str` and bytes are written as `str(value)`.
+
+    >>> from autopalette import Style
+    >>> split([('a', Style(fg=1)), ('b', Style())])
+    ([b'\\x1b[38;5;1m', b'a', b'\\x1b[0m', b'b'], [b'a', b'b'])
+    >>> split(3)
+    ((b'3',), (b'3',))
+    """
+    if hasattr(value, 'plain') and hasattr(value, 'style'):
+        text = value.plain.encode(encoding)
+        style = value.style
+        if style.sgr:
+            return (style.sgr_bytes, text, RESET_BYTES), (text,)
+        return (text,), (text,)
+    if isinstance(value, str):
+        text = value.encode(encoding)
+        return (text,), (text,)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return (value,), (value,)
+    if not isinstance(value, (list, tuple)):
+        text = str(value).encode(encoding)
+        return (text,), (text,)
+    colored = []
+    plain = []
+    style = EMPTY
+    for text, segment_style in value:
+        text = text.encode(encoding)
+        change = transition(style, segment_style)
+        if change:
+            colored.append(change.encode('ascii'))
+        colored.append(text)
+        plain.append(text)
+        style = segment_style
+    if style.sgr:
+        colored.append(RESET_BYTES)
+    return colored, plain
+
+
+class TeeWriter(PrintMixin):
+    """
+    Write to several streams at once, rendering each value once
+    into segments shared by colored and plain streams:
+    the text segments are the same, colored streams also get
+    the escape sequences around them.
+
+    Values are styled strings like `af('x').h1` (their plain text
+    and style are used, no escape sequences are parsed),
+    lists of (text, Style) segments as `Markup.parse()` returns,
+    `str` or bytes. Anything already concatenated into a plain
+    `str` is written as is to all streams, other values as
+    `str(value)` like `print()` does.
+
+    Streams are colored if they are terminals, unless `color`
+    is given for a stream when adding it.
+
+    >>> import io
+    >>> from autopalette import AutoFormat, Ansi256Renderer
+    >>> af = AutoFormat(term_colors=256, renderer=Ansi256Renderer)
+    >>> tty, log = io.BytesIO(), io.BytesIO()
+    >>> with TeeWriter() as tee:
+    ...     tee.add(tty, color=True)
+    ...     tee.add(log)
+    ...     tee.print(af('ERROR').err, 'disk full')
+    ...     tee.print('count', 3)
+    >>> tty.getvalue()
+    b'\\x1b[38;5;231;48;5;196mERROR\\x1b[0m disk full\\ncount 3\\n'
+    >>> log.getvalue()
+    b'ERROR disk full\\ncount 3\\n'
+    """
+
+    def __init__(self, *streams, encoding: str = 'utf-8',
+                 buffer_size: int = 64 * 1024) -> None:
+        self.encoding = encoding
+        self.buffer_size = buffer_size
+        self._colored = []  # type: List[SegmentWriter]
+        self._plain = []  # type: List[SegmentWriter]
+        for stream in streams:
+            self.add(stream)
+
+    def add(self, stream, color: bool = None) -> None:
+        if color is None:
+            try:
+                color = stream.isatty()
+            except (AttributeError, ValueError, OSError):
+                color = False
+        writer = SegmentWriter(stream, encoding=self.encoding,
+                               buffer_size=self.buffer_size)
+        (self._colored if color else self._plain).append(writer)
+
+    def __enter__(self) -> 'TeeWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
+
+    def write(self, value) -> None:
+        colored, plain = split(value, self.encoding)
+        for writer in self._colored:
+            writer.extend(colored)
+        for writer in self._plain:
+            writer.extend(plain)
+
+    def flush(self) -> None:
+        for writer in self._colored + self._plain:
+            writer.flush()